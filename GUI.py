@@ -1,12 +1,94 @@
+import os
+import socket
 import sys
+import time
+from datetime import date
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QPushButton, QLabel, QFrame, QScrollArea,
-                             QLineEdit, QTextEdit, QMessageBox, QDateEdit)
-from PyQt6.QtCore import Qt, QTimer, QDate
+                             QLineEdit, QTextEdit, QMessageBox, QDateEdit,
+                             QComboBox, QCheckBox, QFileDialog, QStackedWidget,
+                             QCalendarWidget)
+from PyQt6.QtCore import Qt, QTimer, QDate, QThread, QPointF, pyqtSignal
+from PyQt6.QtGui import QTextCharFormat, QColor, QPainter, QPen, QPolygonF
 from database import PlantDatabase
+from backup import BackupManager
+from archive import JournalArchive
+from sensors import SensorIngestor
 from styles import Styles
 
 
+class BackgroundTask(QThread):
+    """Run a blocking call off the GUI thread and report back through signals"""
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, func, *args):
+        super().__init__()
+        self.func = func
+        self.args = args
+
+    def run(self):
+        try:
+            result = self.func(*self.args)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.succeeded.emit(result)
+
+
+class SensorChart(QWidget):
+    """Line chart of rollup averages with a min/max band"""
+
+    def __init__(self):
+        super().__init__()
+        self.points = []
+        self.setMinimumHeight(160)
+
+    def set_points(self, points):
+        """points are (timestamp, average, min, max) rows, oldest first"""
+        self.points = points
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.fillRect(self.rect(), QColor(Styles.WHITE))
+
+        plot = self.rect().adjusted(50, 10, -10, -10)
+        painter.setPen(QPen(QColor(Styles.LIGHT_BROWN)))
+        painter.drawRect(plot)
+
+        if not self.points:
+            painter.drawText(plot, Qt.AlignmentFlag.AlignCenter, "No readings in this range yet")
+            return
+
+        low = min(point[2] for point in self.points)
+        high = max(point[3] for point in self.points)
+        if high == low:
+            high = low + 1
+        start, end = self.points[0][0], self.points[-1][0]
+        if end == start:
+            end = start + 1
+
+        def to_pixel(ts, value):
+            x = plot.left() + (ts - start) / (end - start) * plot.width()
+            y = plot.bottom() - (value - low) / (high - low) * plot.height()
+            return QPointF(x, y)
+
+        band = QPolygonF([to_pixel(ts, maximum) for ts, _, _, maximum in self.points] +
+                         [to_pixel(ts, minimum) for ts, _, minimum, _ in reversed(self.points)])
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(Styles.LIGHT_GREEN))
+        painter.drawPolygon(band)
+
+        painter.setPen(QPen(QColor(Styles.PRIMARY_GREEN), 2))
+        painter.drawPolyline(QPolygonF([to_pixel(ts, average) for ts, average, _, _ in self.points]))
+
+        painter.setPen(QPen(QColor(Styles.DARK_TEXT)))
+        painter.drawText(4, plot.top() + 12, f"{high:.1f}")
+        painter.drawText(4, plot.bottom(), f"{low:.1f}")
+
+
 def create_styled_button(text, style, icon=""):
     button_text = f"{icon} {text}" if icon else text
     button = QPushButton(button_text)
@@ -88,12 +170,87 @@ def create_date_edit():
     return date_edit
 
 
+def set_date_from_string(date_edit, value):
+    """Show a yyyy-MM-dd string in a date edit, falling back to today"""
+    try:
+        year, month, day = map(int, value.split('-'))
+        date_edit.setDate(QDate(year, month, day))
+    except (AttributeError, ValueError):
+        date_edit.setDate(QDate.currentDate())
+
+
 class MainWindow(QMainWindow):
-    def __init__(self):
+    # Cards rendered per query; narrower filters reach the rest
+    PLANT_LIST_LIMIT = 200
+    FILTER_DEBOUNCE_MS = 250
+    BACKUP_INTERVAL_SECONDS = 6 * 60 * 60
+    ARCHIVE_HORIZON_DAYS = 365
+    ARCHIVE_PAGE_SIZE = 20
+    SENSOR_REFRESH_MS = 5000
+
+    # Chart range label, rollup resolution, seconds shown
+    SENSOR_RANGES = [
+        ("Last hour", "minute", 60 * 60),
+        ("Last day", "minute", 24 * 60 * 60),
+        ("Last week", "hour", 7 * 24 * 60 * 60),
+        ("Last year", "day", 365 * 24 * 60 * 60),
+    ]
+
+    SORT_OPTIONS = [
+        ("Newest first", "created", True),
+        ("Oldest first", "created", False),
+        ("Name (A-Z)", "name", False),
+        ("Name (Z-A)", "name", True),
+        ("Planting date", "date_planted", False),
+        ("Last watered", "last_watered", True),
+    ]
+
+    def __init__(self, db_name="plant_tracker.db"):
         super().__init__()
-        self.db = PlantDatabase()
+        self.db = PlantDatabase(db_name)
+        # Rewrites the file once, so it runs before any background connection
+        if self.db.enable_incremental_vacuum():
+            print("Converted database to incremental vacuum")
+        # Switches the database to WAL, which needs it to be otherwise idle,
+        # so it comes before the background backup and archive tasks
+        self.sensor_ingestor = SensorIngestor(self.db)
+        self.sensor_ingestor.start()
+        self.backup_manager = BackupManager(self.db.db_name)
+        self.backup_manager.start_schedule(self.BACKUP_INTERVAL_SECONDS)
+        self.backup_task = None
+        self.journal_archive = JournalArchive(self.db.db_name, horizon_days=self.ARCHIVE_HORIZON_DAYS)
+        self.archive_task = BackgroundTask(self.journal_archive.archive_old_entries)
+        self.archive_task.succeeded.connect(self.on_entries_archived)
+        self.archive_task.failed.connect(lambda error: print(f"Error archiving journal entries: {error}"))
+        self.archive_task.start()
+        if hasattr(socket, "AF_UNIX"):
+            try:
+                self.sensor_ingestor.serve_socket(os.path.splitext(self.db.db_name)[0] + ".sock")
+            except OSError as e:
+                print(f"Error opening sensor socket: {e}")
+        self.plant_sort_index = 0
+        self.plant_name_filter = ""
+        self.plant_needs_water_filter = False
+        self.selected_plant_ids = set()
+        # The list is only re-queried when data changed since it was last shown
+        self.plant_list_dirty = True
+        self.plant_list_refreshed_on = None
+        self.editing_plant_id = None
+        self.details_plant_id = None
+        self.editing_journal_id = None
+        self.current_journal_plant_id = None
+        self.setup_filter_timer()
         self.setup_ui()
         self.setup_watering_timer()
+        self.setup_sensor_timer()
+
+    def setup_filter_timer(self):
+        """Debounce timer for the plant name filter"""
+        # Typing restarts the timer so only the last keystroke re-queries
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(self.FILTER_DEBOUNCE_MS)
+        self.filter_timer.timeout.connect(self.refresh_plant_cards)
 
     def setup_watering_timer(self):
         """Setup timer to check for watering status updates"""
@@ -101,11 +258,18 @@ class MainWindow(QMainWindow):
         self.watering_timer.timeout.connect(self.check_watering_status)
         self.watering_timer.start(60000)  # Check every minute
 
+    def setup_sensor_timer(self):
+        """Redraw the live sensor chart while a plant's details are open"""
+        self.sensor_timer = QTimer(self)
+        self.sensor_timer.timeout.connect(self.refresh_live_sensors)
+        self.sensor_timer.start(self.SENSOR_REFRESH_MS)
+
     def check_watering_status(self):
         """Check if we need to refresh watering status (new day)"""
-        # This will automatically handle day changes
-        if hasattr(self, 'current_plants_display'):
-            self.show_plant_list()
+        if self.plant_list_refreshed_on != date.today():
+            self.plant_list_dirty = True
+            if self.view_stack.currentWidget() is self.plant_list_view:
+                self.show_plant_list()
 
     def setup_ui(self):
         self.setWindowTitle("🌿 Plant Growth Tracker")
@@ -118,44 +282,191 @@ class MainWindow(QMainWindow):
         self.main_layout.setContentsMargins(20, 20, 20, 20)
         self.main_layout.setSpacing(15)
 
+        # Every view is built once and re-bound to new data when shown
+        self.view_stack = QStackedWidget()
+        self.plant_list_view = self.build_plant_list_view()
+        self.plant_form_view = self.build_plant_form_view()
+        self.plant_details_view = self.build_plant_details_view()
+        self.journal_form_view = self.build_journal_form_view()
+        self.calendar_view = self.build_calendar_view()
+        for view in (self.plant_list_view, self.plant_form_view,
+                     self.plant_details_view, self.journal_form_view, self.calendar_view):
+            self.view_stack.addWidget(view)
+        self.main_layout.addWidget(self.view_stack)
+
         self.show_plant_list()
 
-    def show_plant_list(self):
-        self.clear_layout()
+    def create_view(self):
+        view = QWidget()
+        layout = QVBoxLayout(view)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(15)
+        return view, layout
+
+    def build_plant_list_view(self):
+        view, layout = self.create_view()
 
         # Title
-        self.main_layout.addWidget(create_title("🌿 My Plants"))
+        layout.addWidget(create_title("🌿 My Plants"))
+
+        # Summary header
+        layout.addWidget(self.create_summary_header())
+
+        # Add Plant and backup buttons
+        top_button_layout = QHBoxLayout()
 
-        # Add Plant Button
         add_btn = create_styled_button("Add New Plant", Styles.PRIMARY_BUTTON, "➕")
         add_btn.clicked.connect(self.show_add_plant_form)
-        self.main_layout.addWidget(add_btn)
+        top_button_layout.addWidget(add_btn, 1)
+
+        calendar_btn = create_styled_button("Calendar", Styles.SECONDARY_BUTTON, "📅")
+        calendar_btn.clicked.connect(self.show_calendar)
+        top_button_layout.addWidget(calendar_btn)
+
+        backup_btn = create_styled_button("Backup", Styles.SECONDARY_BUTTON, "💾")
+        backup_btn.clicked.connect(self.backup_database)
+        top_button_layout.addWidget(backup_btn)
+
+        restore_btn = create_styled_button("Restore", Styles.SECONDARY_BUTTON, "♻️")
+        restore_btn.clicked.connect(self.restore_database)
+        top_button_layout.addWidget(restore_btn)
+
+        layout.addLayout(top_button_layout)
+
+        # Sort and filter controls
+        layout.addLayout(self.create_plant_list_controls())
 
         # Plants container
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
+        self.plant_scroll_area = QScrollArea()
+        self.plant_scroll_area.setWidgetResizable(True)
+        layout.addWidget(self.plant_scroll_area)
+
+        return view
+
+    def show_plant_list(self):
+        if self.plant_list_dirty:
+            self.refresh_plant_list()
+        self.view_stack.setCurrentWidget(self.plant_list_view)
+
+    def refresh_plant_list(self):
+        """Re-query the header and cards, keeping the scroll position"""
+        scroll_bar = self.plant_scroll_area.verticalScrollBar()
+        position = scroll_bar.value()
+
+        self.refresh_summary_header()
+        self.refresh_plant_cards()
+
+        # The new container has no scroll range until it is laid out
+        QTimer.singleShot(0, lambda: scroll_bar.setValue(position))
+        self.plant_list_dirty = False
+        self.plant_list_refreshed_on = date.today()
+
+    def create_plant_list_controls(self):
+        controls_layout = QHBoxLayout()
+        controls_layout.setSpacing(10)
+
+        self.name_filter_input = create_styled_input("line", "Filter by name...", self.plant_name_filter)
+        self.name_filter_input.textChanged.connect(self.schedule_plant_list_refresh)
+        controls_layout.addWidget(self.name_filter_input, 1)
+
+        self.sort_combo = QComboBox()
+        self.sort_combo.addItems([label for label, _, _ in self.SORT_OPTIONS])
+        self.sort_combo.setCurrentIndex(self.plant_sort_index)
+        self.sort_combo.setStyleSheet(f"padding: 10px; border: 2px solid {Styles.LIGHT_BROWN}; border-radius: 8px;")
+        self.sort_combo.currentIndexChanged.connect(self.refresh_plant_cards)
+        controls_layout.addWidget(self.sort_combo)
+
+        self.needs_water_checkbox = QCheckBox("💧 Needs watering")
+        self.needs_water_checkbox.setChecked(self.plant_needs_water_filter)
+        self.needs_water_checkbox.setStyleSheet("font-weight: bold; color: #3e2723;")
+        self.needs_water_checkbox.toggled.connect(self.refresh_plant_cards)
+        controls_layout.addWidget(self.needs_water_checkbox)
+
+        self.delete_selected_btn = create_styled_button("Delete Selected", Styles.DELETE_BUTTON, "🗑️")
+        self.delete_selected_btn.clicked.connect(self.delete_selected_plants)
+        controls_layout.addWidget(self.delete_selected_btn)
+
+        return controls_layout
+
+    def schedule_plant_list_refresh(self):
+        self.filter_timer.start()
+
+    def refresh_plant_cards(self):
+        """Re-query plants with the current controls and rebuild only the cards"""
+        self.plant_sort_index = self.sort_combo.currentIndex()
+        self.plant_name_filter = self.name_filter_input.text().strip()
+        self.plant_needs_water_filter = self.needs_water_checkbox.isChecked()
+        _, sort_by, descending = self.SORT_OPTIONS[self.plant_sort_index]
+
+        plants = self.db.query_plants(
+            sort_by=sort_by,
+            descending=descending,
+            name_prefix=self.plant_name_filter,
+            needs_watering=self.plant_needs_water_filter,
+            limit=self.PLANT_LIST_LIMIT
+        )
+        journal_counts = self.db.get_journal_counts([plant[0] for plant in plants])
+
+        self.selected_plant_ids.clear()
+        self.update_delete_selected_button()
+
         scroll_widget = QWidget()
         scroll_layout = QVBoxLayout(scroll_widget)
 
-        plants = self.db.get_all_plants()
-
         if plants:
             for plant in plants:
-                plant_card = self.create_plant_card(plant)
+                plant_card = self.create_plant_card(plant, journal_counts.get(plant[0], 0))
                 scroll_layout.addWidget(plant_card)
+            if len(plants) == self.PLANT_LIST_LIMIT:
+                more_label = QLabel(f"Showing the first {self.PLANT_LIST_LIMIT} plants. Narrow the filter to see more.")
+                more_label.setStyleSheet("color: #8d6e63; font-size: 13px;")
+                more_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+                scroll_layout.addWidget(more_label)
         else:
-            no_plants = QLabel("No plants yet! Click 'Add New Plant' to start. 🌱")
+            if self.plant_name_filter or self.plant_needs_water_filter:
+                message = "No plants match the current filter."
+            else:
+                message = "No plants yet! Click 'Add New Plant' to start. 🌱"
+            no_plants = QLabel(message)
             no_plants.setStyleSheet("color: #8d6e63; font-size: 14px;")
             no_plants.setAlignment(Qt.AlignmentFlag.AlignCenter)
             scroll_layout.addWidget(no_plants)
 
         scroll_layout.addStretch()
-        scroll_area.setWidget(scroll_widget)
-        self.main_layout.addWidget(scroll_area)
+        # setWidget deletes the previous card container
+        self.plant_scroll_area.setWidget(scroll_widget)
 
         self.current_plants_display = plants  # Track current display
 
-    def create_plant_card(self, plant):
+    def create_summary_header(self):
+        """Collection overview shown above the plant cards"""
+        header = create_card_frame()
+        layout = QHBoxLayout(header)
+        layout.setSpacing(20)
+
+        self.summary_labels = {}
+        for key in ("total_plants", "due_today", "journal_entries"):
+            label = QLabel()
+            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            layout.addWidget(label)
+            self.summary_labels[key] = label
+
+        return header
+
+    def refresh_summary_header(self):
+        stats = self.db.get_dashboard_stats()
+
+        for key, text, style in (
+            ("total_plants", f"🌿 <b>{stats['total_plants']}</b> plants", "color: #2e7d32;"),
+            ("due_today", f"💧 <b>{stats['due_today']}</b> due today",
+             "color: #d32f2f;" if stats['due_today'] else "color: #2e7d32;"),
+            ("journal_entries", f"📖 <b>{stats['journal_entries']}</b> journal entries", "color: #795548;"),
+        ):
+            label = self.summary_labels[key]
+            label.setText(text)
+            label.setStyleSheet(f"font-size: 15px; {style}")
+
+    def create_plant_card(self, plant, journal_count=0):
         plant_id, name, date_planted, care_plan, last_watered, created_at = plant
 
         card = create_card_frame()
@@ -171,6 +482,10 @@ class MainWindow(QMainWindow):
         date_label.setStyleSheet("font-size: 14px; color: #795548; font-weight: bold;")
         layout.addWidget(date_label)
 
+        journal_label = QLabel(f"<b>Journal Entries:</b> {journal_count}")
+        journal_label.setStyleSheet("font-size: 13px; color: #8d6e63;")
+        layout.addWidget(journal_label)
+
         # Watering status
         watering_status = self.get_watering_status(plant)
         status_label = QLabel(watering_status["text"])
@@ -187,6 +502,11 @@ class MainWindow(QMainWindow):
         button_layout = QHBoxLayout()
         button_layout.setSpacing(10)
 
+        select_box = QCheckBox("Select")
+        select_box.setStyleSheet("font-weight: bold; color: #3e2723;")
+        select_box.toggled.connect(lambda checked: self.toggle_plant_selection(plant_id, checked))
+        button_layout.addWidget(select_box)
+
         details_btn = create_styled_button("Details", Styles.ACTION_BUTTON, "🔍")
         details_btn.clicked.connect(lambda: self.show_plant_details(plant))
         button_layout.addWidget(details_btn)
@@ -230,23 +550,16 @@ class MainWindow(QMainWindow):
         """Mark plant as watered and refresh display"""
         success = self.db.water_plant(plant_id)
         if success:
+            self.plant_list_dirty = True
             self.show_plant_list()
             QMessageBox.information(self, "Watering", "Plant marked as watered! 💧")
 
-    def show_add_plant_form(self):
-        self.clear_layout()
-        self.show_plant_form("🌱 Add New Plant", self.save_plant)
-
-    def show_edit_plant_form(self, plant):
-        plant_id, name, date_planted, care_plan, last_watered, created_at = plant
-        self.editing_plant_id = plant_id
-        self.show_plant_form(f"✏️ Edit {name}", self.update_plant, name, date_planted, care_plan)
-
-    def show_plant_form(self, title, save_handler, name="", date_planted="", care=""):
-        self.clear_layout()
+    def build_plant_form_view(self):
+        view, layout = self.create_view()
 
         # Title
-        self.main_layout.addWidget(create_title(title))
+        self.plant_form_title = create_title("")
+        layout.addWidget(self.plant_form_title)
 
         # Form container
         form_frame = create_form_frame()
@@ -254,7 +567,7 @@ class MainWindow(QMainWindow):
         form_layout.setSpacing(10)
 
         # Name field
-        self.name_input = create_styled_input("line", "Enter plant name...", name)
+        self.name_input = create_styled_input("line", "Enter plant name...")
         form_layout.addLayout(create_form_section("Plant Name:", self.name_input))
 
         # Date field - Now using QDateEdit
@@ -263,35 +576,55 @@ class MainWindow(QMainWindow):
         form_layout.addWidget(date_label)
 
         self.date_input = create_date_edit()
-        if date_planted:
-            try:
-                year, month, day = map(int, date_planted.split('-'))
-                self.date_input.setDate(QDate(year, month, day))
-            except:
-                self.date_input.setDate(QDate.currentDate())
         form_layout.addWidget(self.date_input)
 
         # Care instructions
-        self.care_input = create_styled_input("text", "Water every week, bright indirect light...", care)
+        self.care_input = create_styled_input("text", "Water every week, bright indirect light...")
         form_layout.addLayout(create_form_section("Care Instructions:", self.care_input))
 
-        self.main_layout.addWidget(form_frame)
+        layout.addWidget(form_frame)
 
         # Buttons
         button_layout = QHBoxLayout()
 
-        save_text = "💾 Save" if "Add" in title else "💾 Update"
-        save_btn = create_styled_button(save_text, Styles.PRIMARY_BUTTON)
-        save_btn.clicked.connect(save_handler)
-        button_layout.addWidget(save_btn)
+        self.plant_form_save_btn = create_styled_button("", Styles.PRIMARY_BUTTON)
+        self.plant_form_save_btn.clicked.connect(self.submit_plant_form)
+        button_layout.addWidget(self.plant_form_save_btn)
 
         back_btn = create_styled_button("Back to Plants", Styles.SECONDARY_BUTTON, "←")
         back_btn.clicked.connect(self.show_plant_list)
         button_layout.addWidget(back_btn)
 
-        self.main_layout.addLayout(button_layout)
+        layout.addLayout(button_layout)
+        return view
+
+    def show_add_plant_form(self):
+        self.editing_plant_id = None
+        self.show_plant_form("🌱 Add New Plant")
+
+    def show_edit_plant_form(self, plant):
+        plant_id, name, date_planted, care_plan, last_watered, created_at = plant
+        self.editing_plant_id = plant_id
+        self.show_plant_form(f"✏️ Edit {name}", name, date_planted, care_plan)
+
+    def show_plant_form(self, title, name="", date_planted="", care=""):
+        self.plant_form_title.setText(title)
+        self.name_input.setText(name)
+        set_date_from_string(self.date_input, date_planted)
+        self.care_input.setPlainText(care or "")
+
+        save_text = "💾 Save" if self.editing_plant_id is None else "💾 Update"
+        self.plant_form_save_btn.setText(save_text)
+
+        self.view_stack.setCurrentWidget(self.plant_form_view)
         self.name_input.setFocus()
 
+    def submit_plant_form(self):
+        if self.editing_plant_id is None:
+            self.save_plant()
+        else:
+            self.update_plant()
+
     def save_plant(self):
         name = self.name_input.text().strip()
         date_planted = self.date_input.date().toString("yyyy-MM-dd")
@@ -302,10 +635,11 @@ class MainWindow(QMainWindow):
             return
 
         self.db.add_plant(name, date_planted, care_plan)
+        self.plant_list_dirty = True
         self.show_plant_list()
 
     def update_plant(self):
-        if not hasattr(self, 'editing_plant_id'):
+        if self.editing_plant_id is None:
             return
 
         name = self.name_input.text().strip()
@@ -318,97 +652,255 @@ class MainWindow(QMainWindow):
 
         success = self.db.update_plant(self.editing_plant_id, name, date_planted, care_plan)
         if success:
+            self.plant_list_dirty = True
             self.show_plant_list()
 
-    def show_plant_details(self, plant):
-        plant_id, name, date_planted, care_plan, last_watered, created_at = plant
-        self.clear_layout()
+    def build_plant_details_view(self):
+        view, layout = self.create_view()
 
         # Title
-        self.main_layout.addWidget(create_title(f"🌿 {name}"))
+        self.details_title = create_title("")
+        layout.addWidget(self.details_title)
 
         # Plant info
         info_frame = create_form_frame()
         info_layout = QVBoxLayout(info_frame)
 
         # Watering status in details
+        self.details_status_label = QLabel()
+        info_layout.addWidget(self.details_status_label)
+
+        self.details_info_label = QLabel()
+        self.details_info_label.setStyleSheet("color: #3e2723;")
+        self.details_info_label.setWordWrap(True)
+        info_layout.addWidget(self.details_info_label)
+
+        # Water button in details
+        self.details_water_btn = create_styled_button("", Styles.PRIMARY_BUTTON)
+        self.details_water_btn.clicked.connect(self.water_plant_in_details)
+        info_layout.addWidget(self.details_water_btn)
+
+        layout.addWidget(info_frame)
+
+        layout.addWidget(self.build_sensor_section())
+
+        # Journal entries
+        journals_label = QLabel("📖 Journal Entries")
+        journals_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #3e2723; margin-top: 20px;")
+        layout.addWidget(journals_label)
+
+        # Journal entries list
+        self.journal_scroll_area = QScrollArea()
+        self.journal_scroll_area.setWidgetResizable(True)
+        self.journal_scroll_area.verticalScrollBar().valueChanged.connect(self.on_journal_scrolled)
+        layout.addWidget(self.journal_scroll_area, 1)
+
+        # Buttons
+        button_layout = QHBoxLayout()
+
+        add_entry_btn = create_styled_button("Add Journal Entry", Styles.PRIMARY_BUTTON, "📝")
+        add_entry_btn.clicked.connect(lambda: self.show_add_journal_form(self.details_plant_id))
+        button_layout.addWidget(add_entry_btn)
+
+        back_btn = create_styled_button("Back to Plants", Styles.SECONDARY_BUTTON, "←")
+        back_btn.clicked.connect(self.show_plant_list)
+        button_layout.addWidget(back_btn)
+
+        layout.addLayout(button_layout)
+        self.load_archive_btn = None
+        return view
+
+    def show_plant_details(self, plant):
+        plant_id, name, date_planted, care_plan, last_watered, created_at = plant
+        self.details_plant_id = plant_id
+
+        self.details_title.setText(f"🌿 {name}")
+
         watering_status = self.get_watering_status(plant)
-        status_label = QLabel(watering_status["text"])
-        status_label.setStyleSheet(watering_status["style"] + " font-size: 16px; padding: 10px;")
-        info_layout.addWidget(status_label)
+        self.details_status_label.setText(watering_status["text"])
+        self.details_status_label.setStyleSheet(watering_status["style"] + " font-size: 16px; padding: 10px;")
 
-        info_text = f"""
+        self.details_info_label.setText(f"""
         <div style='font-size: 14px;'>
         <p><b>Planted:</b> {date_planted}</p>
         <p><b>Care Instructions:</b><br>{care_plan if care_plan else 'No care instructions added yet.'}</p>
         </div>
-        """
-        info_label = QLabel(info_text)
-        info_label.setStyleSheet("color: #3e2723;")
-        info_label.setWordWrap(True)
-        info_layout.addWidget(info_label)
+        """)
 
-        # Water button in details
         if self.db.needs_watering(plant):
-            water_btn = create_styled_button("Mark as Watered Today", Styles.PRIMARY_BUTTON, "💧")
-            water_btn.clicked.connect(lambda: self.water_plant_in_details(plant_id))
-            info_layout.addWidget(water_btn)
+            self.details_water_btn.setText("💧 Mark as Watered Today")
+            self.details_water_btn.setStyleSheet(Styles.PRIMARY_BUTTON)
+            self.details_water_btn.setEnabled(True)
         else:
-            watered_btn = create_styled_button("Already Watered Today", Styles.SECONDARY_BUTTON, "✅")
-            watered_btn.setEnabled(False)
-            info_layout.addWidget(watered_btn)
+            self.details_water_btn.setText("✅ Already Watered Today")
+            self.details_water_btn.setStyleSheet(Styles.SECONDARY_BUTTON)
+            self.details_water_btn.setEnabled(False)
 
-        self.main_layout.addWidget(info_frame)
+        self.refresh_sensor_list()
+        self.refresh_journal_entries()
+        self.view_stack.setCurrentWidget(self.plant_details_view)
 
-        # Journal entries
-        journals_label = QLabel("📖 Journal Entries")
-        journals_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #3e2723; margin-top: 20px;")
-        self.main_layout.addWidget(journals_label)
+    def build_sensor_section(self):
+        self.sensor_section = QWidget()
+        layout = QVBoxLayout(self.sensor_section)
+        layout.setContentsMargins(0, 0, 0, 0)
 
-        # Journal entries list
+        header_layout = QHBoxLayout()
+
+        sensors_label = QLabel("🌡️ Sensors")
+        sensors_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #3e2723;")
+        header_layout.addWidget(sensors_label, 1)
+
+        self.sensor_latest_label = QLabel()
+        self.sensor_latest_label.setStyleSheet("font-size: 14px; color: #2e7d32; font-weight: bold;")
+        header_layout.addWidget(self.sensor_latest_label)
+
+        self.sensor_combo = QComboBox()
+        self.sensor_combo.currentIndexChanged.connect(self.refresh_sensor_chart)
+        header_layout.addWidget(self.sensor_combo)
+
+        self.sensor_range_combo = QComboBox()
+        self.sensor_range_combo.addItems([label for label, _, _ in self.SENSOR_RANGES])
+        self.sensor_range_combo.currentIndexChanged.connect(self.refresh_sensor_chart)
+        header_layout.addWidget(self.sensor_range_combo)
+
+        layout.addLayout(header_layout)
+
+        self.sensor_chart = SensorChart()
+        layout.addWidget(self.sensor_chart)
+
+        return self.sensor_section
+
+    def refresh_sensor_list(self):
+        """Offer the sensors that have reported for the shown plant"""
+        sensors = self.sensor_ingestor.store.get_sensors(self.details_plant_id)
+        current = self.sensor_combo.currentText()
+
+        self.sensor_combo.blockSignals(True)
+        self.sensor_combo.clear()
+        self.sensor_combo.addItems(sensors)
+        if current in sensors:
+            self.sensor_combo.setCurrentText(current)
+        self.sensor_combo.blockSignals(False)
+
+        self.sensor_section.setVisible(bool(sensors))
+        self.refresh_sensor_chart()
+
+    def refresh_live_sensors(self):
+        # Also picks up probes that start reporting while the view is open
+        if self.view_stack.currentWidget() is self.plant_details_view:
+            self.refresh_sensor_list()
+
+    def refresh_sensor_chart(self):
+        """Plot the selected sensor from its rollups; raw readings are never scanned"""
+        sensor = self.sensor_combo.currentText()
+        if self.details_plant_id is None or not sensor:
+            return
+
+        _, resolution, seconds = self.SENSOR_RANGES[self.sensor_range_combo.currentIndex()]
+        points = self.sensor_ingestor.store.get_rollups(
+            self.details_plant_id, sensor, resolution, time.time() - seconds
+        )
+        self.sensor_chart.set_points(points)
+        if points:
+            self.sensor_latest_label.setText(f"Latest: {points[-1][1]:.1f}")
+        else:
+            self.sensor_latest_label.setText("")
+
+    def refresh_journal_entries(self):
+        """Rebuild the journal cards for the plant shown in the details view"""
+        plant_id = self.details_plant_id
         entries = self.db.get_journal_entries(plant_id)
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
         scroll_widget = QWidget()
         scroll_layout = QVBoxLayout(scroll_widget)
         scroll_layout.setSpacing(10)
 
+        has_archived = self.journal_archive.has_entries(plant_id)
+
         if entries:
             for entry in entries:
                 entry_id, entry_plant_id, entry_date, notes, entry_created = entry
                 entry_card = self.create_journal_entry_card(entry_id, entry_date, notes, plant_id)
                 scroll_layout.addWidget(entry_card)
         else:
-            no_entries = QLabel("No journal entries yet. Click 'Add Entry' to start!")
+            if has_archived:
+                message = "No recent journal entries."
+            else:
+                message = "No journal entries yet. Click 'Add Entry' to start!"
+            no_entries = QLabel(message)
             no_entries.setStyleSheet("color: #8d6e63; font-size: 14px; padding: 20px;")
             no_entries.setAlignment(Qt.AlignmentFlag.AlignCenter)
             scroll_layout.addWidget(no_entries)
 
-        scroll_layout.addStretch()
-        scroll_area.setWidget(scroll_widget)
-        self.main_layout.addWidget(scroll_area, 1)
-
-        # Buttons
-        button_layout = QHBoxLayout()
-
-        add_entry_btn = create_styled_button("Add Journal Entry", Styles.PRIMARY_BUTTON, "📝")
-        add_entry_btn.clicked.connect(lambda: self.show_add_journal_form(plant_id))
-        button_layout.addWidget(add_entry_btn)
-
-        back_btn = create_styled_button("Back to Plants", Styles.SECONDARY_BUTTON, "←")
-        back_btn.clicked.connect(self.show_plant_list)
-        button_layout.addWidget(back_btn)
+        # Archived entries are only fetched once the user scrolls past the live ones
+        self.archive_cursor = None
+        self.archive_layout = scroll_layout
+        self.load_archive_btn = None
+        if has_archived:
+            self.load_archive_btn = create_styled_button("Load Older Entries", Styles.SECONDARY_BUTTON, "🗄️")
+            self.load_archive_btn.clicked.connect(self.load_archived_entries)
+            scroll_layout.addWidget(self.load_archive_btn)
 
-        self.main_layout.addLayout(button_layout)
+        scroll_layout.addStretch()
+        # setWidget deletes the previous plant's entries
+        self.journal_scroll_area.setWidget(scroll_widget)
 
-    def water_plant_in_details(self, plant_id):
+    def water_plant_in_details(self):
         """Water plant from details view and refresh details"""
-        success = self.db.water_plant(plant_id)
+        success = self.db.water_plant(self.details_plant_id)
         if success:
-            plant = self.db.get_plant_by_id(plant_id)
+            self.plant_list_dirty = True
+            plant = self.db.get_plant_by_id(self.details_plant_id)
             self.show_plant_details(plant)
             QMessageBox.information(self, "Watering", "Plant marked as watered! 💧")
 
+    def on_journal_scrolled(self, value):
+        if value == self.journal_scroll_area.verticalScrollBar().maximum():
+            self.load_archived_entries()
+
+    def load_archived_entries(self):
+        """Append the next page of archived entries above the load button"""
+        if self.load_archive_btn is None:
+            return
+
+        entries = self.journal_archive.get_entries(
+            self.details_plant_id, before=self.archive_cursor, limit=self.ARCHIVE_PAGE_SIZE
+        )
+        insert_at = self.archive_layout.indexOf(self.load_archive_btn)
+        for entry_id, entry_plant_id, entry_date, notes, entry_created in entries:
+            self.archive_layout.insertWidget(insert_at, self.create_archived_entry_card(entry_date, notes))
+            insert_at += 1
+
+        if entries:
+            self.archive_cursor = (entries[-1][2], entries[-1][0])
+
+        if len(entries) < self.ARCHIVE_PAGE_SIZE:
+            self.archive_layout.removeWidget(self.load_archive_btn)
+            self.load_archive_btn.deleteLater()
+            self.load_archive_btn = None
+
+    def on_entries_archived(self, archived):
+        if archived:
+            self.plant_list_dirty = True
+            if self.view_stack.currentWidget() is self.plant_list_view:
+                self.show_plant_list()
+
+    def create_archived_entry_card(self, date, notes):
+        card = create_card_frame()
+        layout = QVBoxLayout(card)
+        layout.setSpacing(10)
+
+        date_label = QLabel(f"<b>📅 Date:</b> {date} <i>(archived)</i>")
+        date_label.setStyleSheet("font-size: 14px; color: #795548; font-weight: bold;")
+        layout.addWidget(date_label)
+
+        notes_label = QLabel(f"<b>Notes:</b> {notes}")
+        notes_label.setStyleSheet("color: #8d6e63; font-size: 13px;")
+        notes_label.setWordWrap(True)
+        layout.addWidget(notes_label)
+
+        return card
+
     def create_journal_entry_card(self, entry_id, date, notes, plant_id):
         card = create_card_frame()
         layout = QVBoxLayout(card)
@@ -438,11 +930,11 @@ class MainWindow(QMainWindow):
         layout.addLayout(button_layout)
         return card
 
-    def show_add_journal_form(self, plant_id):
-        self.clear_layout()
-        self.current_journal_plant_id = plant_id
+    def build_journal_form_view(self):
+        view, layout = self.create_view()
 
-        self.main_layout.addWidget(create_title("📝 Add Journal Entry"))
+        self.journal_form_title = create_title("")
+        layout.addWidget(self.journal_form_title)
 
         # Form container
         form_frame = create_form_frame()
@@ -462,21 +954,32 @@ class MainWindow(QMainWindow):
         self.journal_notes_input.setMinimumHeight(120)
         form_layout.addLayout(create_form_section("Notes:", self.journal_notes_input))
 
-        self.main_layout.addWidget(form_frame)
+        layout.addWidget(form_frame)
 
         # Buttons
         button_layout = QHBoxLayout()
 
-        save_btn = create_styled_button("Save Entry", Styles.PRIMARY_BUTTON, "💾")
-        save_btn.clicked.connect(self.save_journal_entry)
-        button_layout.addWidget(save_btn)
+        self.journal_form_save_btn = create_styled_button("", Styles.PRIMARY_BUTTON)
+        self.journal_form_save_btn.clicked.connect(self.submit_journal_form)
+        button_layout.addWidget(self.journal_form_save_btn)
 
         back_btn = create_styled_button("Cancel", Styles.SECONDARY_BUTTON, "←")
-        plant = self.db.get_plant_by_id(plant_id)
-        back_btn.clicked.connect(lambda: self.show_plant_details(plant))
+        back_btn.clicked.connect(lambda: self.view_stack.setCurrentWidget(self.plant_details_view))
         button_layout.addWidget(back_btn)
 
-        self.main_layout.addLayout(button_layout)
+        layout.addLayout(button_layout)
+        return view
+
+    def show_add_journal_form(self, plant_id):
+        self.editing_journal_id = None
+        self.current_journal_plant_id = plant_id
+
+        self.journal_form_title.setText("📝 Add Journal Entry")
+        self.journal_date_input.setDate(QDate.currentDate())
+        self.journal_notes_input.clear()
+        self.journal_form_save_btn.setText("💾 Save Entry")
+
+        self.view_stack.setCurrentWidget(self.journal_form_view)
         self.journal_notes_input.setFocus()
 
     def show_edit_journal_form(self, entry_id, plant_id):
@@ -490,51 +993,22 @@ class MainWindow(QMainWindow):
         self.editing_journal_id = entry_id
         self.current_journal_plant_id = plant_id
 
-        self.clear_layout()
-        self.main_layout.addWidget(create_title("✏️ Edit Journal Entry"))
-
-        # Form container
-        form_frame = create_form_frame()
-        form_layout = QVBoxLayout(form_frame)
-        form_layout.setSpacing(15)
-
-        # Date field - Using QDateEdit
-        date_label = QLabel("Entry Date:")
-        date_label.setStyleSheet("font-weight: bold; color: #3e2723;")
-        form_layout.addWidget(date_label)
-
-        self.journal_date_input = create_date_edit()
-        try:
-            year, month, day = map(int, entry_date.split('-'))
-            self.journal_date_input.setDate(QDate(year, month, day))
-        except:
-            self.journal_date_input.setDate(QDate.currentDate())
-        form_layout.addWidget(self.journal_date_input)
-
-        # Notes field
-        self.journal_notes_input = create_styled_input("text", "New leaves growing, looking healthy...", notes)
-        self.journal_notes_input.setMinimumHeight(35)
-        form_layout.addLayout(create_form_section("Notes:", self.journal_notes_input))
-
-        self.main_layout.addWidget(form_frame)
-
-        # Buttons
-        button_layout = QHBoxLayout()
-
-        save_btn = create_styled_button("Update Entry", Styles.PRIMARY_BUTTON, "💾")
-        save_btn.clicked.connect(self.update_journal_entry)
-        button_layout.addWidget(save_btn)
-
-        back_btn = create_styled_button("Cancel", Styles.SECONDARY_BUTTON, "←")
-        plant = self.db.get_plant_by_id(plant_id)
-        back_btn.clicked.connect(lambda: self.show_plant_details(plant))
-        button_layout.addWidget(back_btn)
+        self.journal_form_title.setText("✏️ Edit Journal Entry")
+        set_date_from_string(self.journal_date_input, entry_date)
+        self.journal_notes_input.setPlainText(notes)
+        self.journal_form_save_btn.setText("💾 Update Entry")
 
-        self.main_layout.addLayout(button_layout)
+        self.view_stack.setCurrentWidget(self.journal_form_view)
         self.journal_notes_input.setFocus()
 
+    def submit_journal_form(self):
+        if self.editing_journal_id is None:
+            self.save_journal_entry()
+        else:
+            self.update_journal_entry()
+
     def update_journal_entry(self):
-        if not hasattr(self, 'editing_journal_id'):
+        if self.editing_journal_id is None:
             return
 
         entry_date = self.journal_date_input.date().toString("yyyy-MM-dd")
@@ -558,11 +1032,12 @@ class MainWindow(QMainWindow):
 
         if reply == QMessageBox.StandardButton.Yes:
             self.db.delete_journal_entry(entry_id)
+            self.plant_list_dirty = True
             plant = self.db.get_plant_by_id(plant_id)
             self.show_plant_details(plant)
 
     def save_journal_entry(self):
-        if not hasattr(self, 'current_journal_plant_id'):
+        if self.current_journal_plant_id is None:
             return
 
         entry_date = self.journal_date_input.date().toString("yyyy-MM-dd")
@@ -573,9 +1048,119 @@ class MainWindow(QMainWindow):
             return
 
         self.db.add_journal_entry(self.current_journal_plant_id, entry_date, notes)
+        self.plant_list_dirty = True
         plant = self.db.get_plant_by_id(self.current_journal_plant_id)
         self.show_plant_details(plant)
 
+    def build_calendar_view(self):
+        view, layout = self.create_view()
+
+        layout.addWidget(create_title("📅 Care Calendar"))
+
+        self.calendar_summary_label = QLabel()
+        self.calendar_summary_label.setStyleSheet("font-size: 15px; color: #3e2723;")
+        self.calendar_summary_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.calendar_summary_label)
+
+        self.calendar = QCalendarWidget()
+        self.calendar.setGridVisible(True)
+        self.calendar.setStyleSheet(f"background-color: {Styles.WHITE}; color: {Styles.DARK_TEXT};")
+        self.calendar.currentPageChanged.connect(self.refresh_calendar_month)
+        self.calendar.selectionChanged.connect(self.refresh_calendar_day)
+        layout.addWidget(self.calendar)
+
+        self.calendar_day_label = QLabel()
+        self.calendar_day_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #3e2723;")
+        layout.addWidget(self.calendar_day_label)
+
+        # Drill-down: plants watered or written about on the selected day
+        self.calendar_day_scroll_area = QScrollArea()
+        self.calendar_day_scroll_area.setWidgetResizable(True)
+        layout.addWidget(self.calendar_day_scroll_area, 1)
+
+        back_btn = create_styled_button("Back to Plants", Styles.SECONDARY_BUTTON, "←")
+        back_btn.clicked.connect(self.show_plant_list)
+        layout.addWidget(back_btn)
+
+        return view
+
+    def show_calendar(self):
+        self.refresh_calendar_month(self.calendar.yearShown(), self.calendar.monthShown())
+        self.refresh_calendar_day()
+        self.view_stack.setCurrentWidget(self.calendar_view)
+
+    def refresh_calendar_month(self, year, month):
+        """Shade each day of the shown month from the daily aggregates"""
+        first_day = QDate(year, month, 1)
+        last_day = first_day.addDays(first_day.daysInMonth() - 1)
+        activity = self.db.get_daily_activity(
+            first_day.toString("yyyy-MM-dd"), last_day.toString("yyyy-MM-dd")
+        )
+
+        # A null date resets the formats of every day
+        self.calendar.setDateTextFormat(QDate(), QTextCharFormat())
+
+        total_watered = total_journals = 0
+        for day, (watered, journals) in activity.items():
+            if not watered and not journals:
+                continue
+            total_watered += watered
+            total_journals += journals
+
+            text_format = QTextCharFormat()
+            text_format.setBackground(QColor(Styles.LIGHT_GREEN if watered else Styles.LIGHT_BROWN))
+            text_format.setFontWeight(700)
+            text_format.setToolTip(f"💧 {watered} watered · 📖 {journals} journal entries")
+            self.calendar.setDateTextFormat(QDate.fromString(day, "yyyy-MM-dd"), text_format)
+
+        self.calendar_summary_label.setText(
+            f"💧 <b>{total_watered}</b> waterings · 📖 <b>{total_journals}</b> journal entries "
+            f"in {first_day.toString('MMMM yyyy')}"
+        )
+
+    def refresh_calendar_day(self):
+        day = self.calendar.selectedDate()
+        self.calendar_day_label.setText(f"🌿 {day.toString('dddd, MMMM d, yyyy')}")
+
+        scroll_widget = QWidget()
+        scroll_layout = QVBoxLayout(scroll_widget)
+        scroll_layout.setSpacing(10)
+
+        activity = self.db.get_day_activity(day.toString("yyyy-MM-dd"))
+        if activity:
+            for plant, watered, journal_count in activity:
+                scroll_layout.addWidget(self.create_day_activity_card(plant, watered, journal_count))
+        else:
+            no_activity = QLabel("No watering or journal activity on this day.")
+            no_activity.setStyleSheet("color: #8d6e63; font-size: 14px; padding: 20px;")
+            no_activity.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            scroll_layout.addWidget(no_activity)
+
+        scroll_layout.addStretch()
+        self.calendar_day_scroll_area.setWidget(scroll_widget)
+
+    def create_day_activity_card(self, plant, watered, journal_count):
+        plant_id, name, date_planted, care_plan, last_watered, created_at = plant
+
+        card = create_card_frame()
+        layout = QHBoxLayout(card)
+
+        parts = []
+        if watered:
+            parts.append("💧 Watered")
+        if journal_count:
+            parts.append(f"📖 {journal_count} journal entr{'y' if journal_count == 1 else 'ies'}")
+
+        label = QLabel(f"<b>{name}</b> — {' · '.join(parts)}")
+        label.setStyleSheet("font-size: 14px; color: #2e7d32;")
+        layout.addWidget(label, 1)
+
+        details_btn = create_styled_button("Details", Styles.ACTION_BUTTON, "🔍")
+        details_btn.clicked.connect(lambda: self.show_plant_details(plant))
+        layout.addWidget(details_btn)
+
+        return card
+
     def delete_plant(self, plant):
         plant_id, name, date_planted, care_plan, last_watered, created_at = plant
 
@@ -588,10 +1173,90 @@ class MainWindow(QMainWindow):
         if reply == QMessageBox.StandardButton.Yes:
             success = self.db.delete_plant(plant_id)
             if success:
+                self.plant_list_dirty = True
+                self.show_plant_list()
+
+    def toggle_plant_selection(self, plant_id, checked):
+        if checked:
+            self.selected_plant_ids.add(plant_id)
+        else:
+            self.selected_plant_ids.discard(plant_id)
+        self.update_delete_selected_button()
+
+    def update_delete_selected_button(self):
+        count = len(self.selected_plant_ids)
+        self.delete_selected_btn.setEnabled(count > 0)
+        self.delete_selected_btn.setText(f"🗑️ Delete Selected ({count})" if count else "🗑️ Delete Selected")
+
+    def delete_selected_plants(self):
+        if not self.selected_plant_ids:
+            return
+
+        count = len(self.selected_plant_ids)
+        reply = QMessageBox.question(
+            self, 'Confirm Delete',
+            f'Are you sure you want to delete {count} selected plant(s)?',
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+
+        if reply == QMessageBox.StandardButton.Yes:
+            plant_ids = list(self.selected_plant_ids)
+            success = self.db.delete_plants(plant_ids)
+            if success:
+                self.plant_list_dirty = True
                 self.show_plant_list()
 
-    def clear_layout(self):
-        while self.main_layout.count():
-            child = self.main_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+    def run_backup_task(self, func, *args, on_success):
+        if self.backup_task is not None and self.backup_task.isRunning():
+            QMessageBox.information(self, "Backup", "A backup or restore is already in progress.")
+            return
+
+        self.backup_task = BackgroundTask(func, *args)
+        self.backup_task.succeeded.connect(on_success)
+        self.backup_task.failed.connect(
+            lambda error: QMessageBox.warning(self, "Backup Error", error)
+        )
+        self.backup_task.start()
+
+    def backup_database(self):
+        """Snapshot the database in the background"""
+        self.run_backup_task(
+            self.backup_manager.create_backup,
+            on_success=lambda path: QMessageBox.information(self, "Backup", f"Backup saved to:\n{path} 💾")
+        )
+
+    def restore_database(self):
+        backups = self.backup_manager.list_backups()
+        start_dir = backups[0] if backups else self.backup_manager.backup_dir
+        archive_path, _ = QFileDialog.getOpenFileName(
+            self, "Restore Backup", start_dir, "Plant Tracker Backups (*.db.gz)"
+        )
+        if not archive_path:
+            return
+
+        reply = QMessageBox.question(
+            self, 'Confirm Restore',
+            'Restoring replaces all current plants and journal entries. Continue?',
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+
+        if reply == QMessageBox.StandardButton.Yes:
+            self.run_backup_task(
+                self.backup_manager.restore_backup, archive_path,
+                on_success=lambda _: self.finish_restore()
+            )
+
+    def finish_restore(self):
+        # Older backups may predate the current schema
+        self.db.create_tables()
+        self.plant_list_dirty = True
+        self.show_plant_list()
+        QMessageBox.information(self, "Restore", "Backup restored successfully! ♻️")
+
+    def closeEvent(self, event):
+        self.backup_manager.stop_schedule()
+        if self.backup_task is not None:
+            self.backup_task.wait()
+        self.archive_task.wait()
+        self.sensor_ingestor.stop()
+        super().closeEvent(event)
@@ -0,0 +1,284 @@
+import os
+import sqlite3
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+
+def compress_notes(notes):
+    if notes is None:
+        return None
+    return zlib.compress(notes.encode("utf-8"))
+
+
+def decompress_notes(blob):
+    if blob is None:
+        return None
+    return zlib.decompress(blob).decode("utf-8")
+
+
+def archive_name_for(db_name):
+    return os.path.splitext(db_name)[0] + "_archive.db"
+
+
+def archived_entry_counts(archive_name):
+    """(entry_date, plant_id, count) rows for an archive file; empty if there is none yet"""
+    if not os.path.exists(archive_name):
+        return []
+    conn = sqlite3.connect(archive_name)
+    try:
+        return conn.execute('''
+            SELECT entry_date, plant_id, COUNT(*) FROM archived_journal_entries
+            WHERE entry_date IS NOT NULL AND plant_id IS NOT NULL
+            GROUP BY entry_date, plant_id
+        ''').fetchall()
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        conn.close()
+
+
+class JournalArchive:
+    """Cold storage for old journal entries.
+
+    Entries older than the horizon are moved into a separate database with
+    zlib-compressed notes, keeping journal_entries in the main database small.
+    """
+
+    BUSY_TIMEOUT = 10
+    BUSY_RETRIES = 5
+    BUSY_RETRY_DELAY = 0.5
+
+    def __init__(self, db_name="plant_tracker.db", archive_name=None, horizon_days=365):
+        self.db_name = db_name
+        if archive_name is None:
+            archive_name = archive_name_for(db_name)
+        self.archive_name = archive_name
+        self.horizon_days = horizon_days
+        self.create_tables()
+
+    def create_tables(self):
+        with sqlite3.connect(self.archive_name) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS archived_journal_entries (
+                    id INTEGER PRIMARY KEY,
+                    plant_id INTEGER,
+                    entry_date DATE,
+                    notes BLOB,
+                    created_at DATETIME,
+                    archived_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_archived_plant_date
+                ON archived_journal_entries (plant_id, entry_date DESC, id DESC)
+            ''')
+
+    def connect(self):
+        """Main database with the archive attached.
+
+        Autocommit mode, so write_transaction decides when transactions begin.
+        """
+        conn = sqlite3.connect(self.db_name, timeout=self.BUSY_TIMEOUT, isolation_level=None)
+        conn.execute("ATTACH DATABASE ? AS archive", (self.archive_name,))
+        return conn
+
+    @contextmanager
+    def write_transaction(self, conn):
+        """BEGIN IMMEDIATE, retried while another connection holds the write lock.
+
+        A deferred transaction that reads before it writes fails straight away
+        with "database is locked" when it upgrades, without waiting for the
+        busy timeout; taking the lock up front waits instead.
+        """
+        for attempt in range(self.BUSY_RETRIES):
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                break
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e) or attempt == self.BUSY_RETRIES - 1:
+                    raise
+                time.sleep(self.BUSY_RETRY_DELAY)
+
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def archive_old_entries(self):
+        """Move entries older than the horizon out of the main database.
+
+        In WAL mode a transaction over attached files is only atomic per file,
+        so the move is done in two steps that are safe to repeat: copy into
+        the archive and commit, then delete the copied rows from the main
+        database along with the counter updates. A crash in between leaves
+        entries in both files, and the next run finishes moving them.
+
+        Returns the number of entries archived.
+        """
+        cutoff = (date.today() - timedelta(days=self.horizon_days)).isoformat()
+
+        conn = self.connect()
+        try:
+            conn.create_function("compress_notes", 1, compress_notes, deterministic=True)
+
+            with self.write_transaction(conn):
+                conn.execute('''
+                    INSERT OR REPLACE INTO archive.archived_journal_entries
+                        (id, plant_id, entry_date, notes, created_at)
+                    SELECT id, plant_id, entry_date, compress_notes(notes), created_at
+                    FROM main.journal_entries WHERE entry_date < ?
+                ''', (cutoff,))
+
+            # Only rows whose archived copy is identical; an entry edited since
+            # the copy stays put until the next run archives it again
+            copied = '''
+                SELECT j.id FROM main.journal_entries j
+                JOIN archive.archived_journal_entries a ON a.id = j.id
+                WHERE j.entry_date < ? AND a.plant_id IS j.plant_id AND a.entry_date IS j.entry_date
+                  AND a.notes IS compress_notes(j.notes)
+            '''
+            with self.write_transaction(conn):
+                counts = conn.execute(f'''
+                    SELECT entry_date, plant_id, COUNT(*) FROM main.journal_entries
+                    WHERE id IN ({copied}) GROUP BY entry_date, plant_id
+                ''', (cutoff,)).fetchall()
+                self.pause_sync_log(conn, True)
+                moved = conn.execute(
+                    f"DELETE FROM main.journal_entries WHERE id IN ({copied})", (cutoff,)
+                ).rowcount
+                self.pause_sync_log(conn, False)
+                self.restore_counts(conn, counts)
+
+            if moved:
+                self.reclaim_space(conn)
+            return moved
+        finally:
+            conn.close()
+
+    def pause_sync_log(self, conn, paused):
+        """Keep the replica sync triggers from logging archive moves as deletions.
+
+        A logged delete would remove the entries from every other replica,
+        which has no archive copy of them.
+        """
+        has_sync = conn.execute(
+            "SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = 'sync_meta'"
+        ).fetchone()
+        if has_sync:
+            conn.execute("UPDATE main.sync_meta SET applying = ? WHERE id = 1", (int(paused),))
+
+    def restore_counts(self, conn, counts):
+        """Add archived entries back into the journal counters of the main database.
+
+        The journal delete triggers take archived entries out of the calendar
+        and the list header counts; both should still include them.
+        """
+        for day, plant_id, count in counts:
+            conn.execute(
+                "UPDATE main.collection_stats SET journal_count = journal_count + ? WHERE id = 1", (count,)
+            )
+            conn.execute(
+                "UPDATE main.plant_stats SET journal_count = journal_count + ? WHERE plant_id = ?",
+                (count, plant_id)
+            )
+            conn.execute("INSERT OR IGNORE INTO main.daily_activity (day) VALUES (?)", (day,))
+            conn.execute(
+                "UPDATE main.daily_activity SET journal_count = journal_count + ? WHERE day = ?",
+                (count, day)
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO main.daily_plant_activity (day, plant_id) VALUES (?, ?)",
+                (day, plant_id)
+            )
+            conn.execute(
+                "UPDATE main.daily_plant_activity SET journal_count = journal_count + ? WHERE day = ? AND plant_id = ?",
+                (count, day, plant_id)
+            )
+
+    def reclaim_space(self, conn):
+        """Return every free page to the filesystem with incremental vacuum.
+
+        Databases created before incremental mode are converted once at
+        startup by PlantDatabase.enable_incremental_vacuum; until then their
+        free pages are only reused by later inserts.
+        """
+        auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        if auto_vacuum != 2:
+            return
+        # Without a count the pragma frees the whole freelist, one page per
+        # step; executescript runs it to completion
+        conn.executescript("PRAGMA incremental_vacuum;")
+
+    def get_entries(self, plant_id, before=None, limit=20):
+        """Archived entries for a plant, newest first.
+
+        before is the (entry_date, id) of the last entry already shown.
+        """
+        with sqlite3.connect(self.archive_name) as conn:
+            if before is None:
+                rows = conn.execute('''
+                    SELECT id, plant_id, entry_date, notes, created_at FROM archived_journal_entries
+                    WHERE plant_id = ? ORDER BY entry_date DESC, id DESC LIMIT ?
+                ''', (plant_id, limit)).fetchall()
+            else:
+                rows = conn.execute('''
+                    SELECT id, plant_id, entry_date, notes, created_at FROM archived_journal_entries
+                    WHERE plant_id = ? AND (entry_date, id) < (?, ?)
+                    ORDER BY entry_date DESC, id DESC LIMIT ?
+                ''', (plant_id, before[0], before[1], limit)).fetchall()
+
+        return [
+            (entry_id, entry_plant_id, entry_date, decompress_notes(notes), created_at)
+            for entry_id, entry_plant_id, entry_date, notes, created_at in rows
+        ]
+
+    def has_entries(self, plant_id):
+        with sqlite3.connect(self.archive_name) as conn:
+            row = conn.execute(
+                "SELECT 1 FROM archived_journal_entries WHERE plant_id = ? LIMIT 1", (plant_id,)
+            ).fetchone()
+        return row is not None
+
+    def delete_plant_entries(self, plant_ids):
+        """Drop archived entries belonging to deleted plants.
+
+        Counters are committed before the archive rows go; if the second step
+        is lost, only rows of plants that no longer exist are left behind.
+        """
+        plant_ids = list(plant_ids)
+        conn = self.connect()
+        try:
+            for start in range(0, len(plant_ids), 500):
+                chunk = plant_ids[start:start + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                with self.write_transaction(conn):
+                    counts = conn.execute(f'''
+                        SELECT entry_date, plant_id, COUNT(*) FROM archive.archived_journal_entries
+                        WHERE plant_id IN ({placeholders}) GROUP BY entry_date, plant_id
+                    ''', tuple(chunk)).fetchall()
+                    # The plant delete already dropped its plant_stats and per-plant calendar rows
+                    for day, plant_id, count in counts:
+                        conn.execute(
+                            "UPDATE main.collection_stats SET journal_count = journal_count - ? WHERE id = 1",
+                            (count,)
+                        )
+                        conn.execute(
+                            "UPDATE main.daily_activity SET journal_count = journal_count - ? WHERE day = ?",
+                            (count, day)
+                        )
+                with self.write_transaction(conn):
+                    conn.execute(
+                        f"DELETE FROM archive.archived_journal_entries WHERE plant_id IN ({placeholders})",
+                        tuple(chunk)
+                    )
+            return True
+        except Exception as e:
+            print(f"Error deleting archived journal entries: {e}")
+            return False
+        finally:
+            conn.close()
@@ -0,0 +1,230 @@
+import gzip
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import closing
+from datetime import datetime
+
+from archive import archive_name_for
+
+
+class BackupError(Exception):
+    pass
+
+
+class BackupManager:
+    """Online snapshots of the plant database using the SQLite backup API.
+
+    Writes keep running while a snapshot is taken: a WAL database is copied
+    from one read snapshot, other files in small steps with a short sleep in
+    between. The
+    journal archive database, when there is one, is saved next to each
+    snapshot and restored with it.
+    """
+
+    PAGES_PER_STEP = 1024
+    STEP_SLEEP = 0.005
+    ARCHIVE_SUFFIX = ".db.gz"
+    JOURNAL_ARCHIVE_SUFFIX = ".journal.gz"
+    TIMESTAMP_PATTERN = re.compile(r"\d{8}-\d{6}-\d{6}")
+    REQUIRED_TABLES = ("plants", "journal_entries")
+    JOURNAL_ARCHIVE_TABLES = ("archived_journal_entries",)
+
+    def __init__(self, db_name="plant_tracker.db", backup_dir=None, retention=7, archive_name=None):
+        self.db_name = db_name
+        self.archive_name = archive_name or archive_name_for(db_name)
+        if backup_dir is None:
+            backup_dir = os.path.join(os.path.dirname(os.path.abspath(db_name)), "backups")
+        self.backup_dir = backup_dir
+        self.retention = retention
+        # Archives are named after the database so several can share a directory
+        self.archive_prefix = os.path.splitext(os.path.basename(db_name))[0] + "-"
+        self._lock = threading.Lock()
+        self._schedule_stop = None
+        self._schedule_thread = None
+
+    def copy_database(self, source_name, target_name, progress=None):
+        """Copy source into target with the backup API.
+
+        A stepped copy starts over whenever another connection writes to the
+        source, so under steady sensor ingestion it never finishes. In WAL
+        mode a single step reads one snapshot without blocking the writer.
+        """
+        source = sqlite3.connect(source_name)
+        target = sqlite3.connect(target_name)
+        try:
+            wal = source.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            pages = -1 if wal else self.PAGES_PER_STEP
+            source.backup(target, pages=pages, progress=progress, sleep=self.STEP_SLEEP)
+        finally:
+            target.close()
+            source.close()
+
+    def verify_database(self, path, required_tables=REQUIRED_TABLES):
+        """Raise BackupError unless path is an intact database with the required tables"""
+        try:
+            # Closed before returning, so the caller can remove the file and its WAL
+            with closing(sqlite3.connect(path)) as conn:
+                result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+                if result != "ok":
+                    raise BackupError(f"Integrity check failed: {result}")
+                tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        except sqlite3.DatabaseError as e:
+            raise BackupError(f"Not a valid database: {e}")
+
+        missing = [table for table in required_tables if table not in tables]
+        if missing:
+            raise BackupError(f"Backup is missing tables: {', '.join(missing)}")
+
+    def remove_database(self, path):
+        """Delete a temporary database file along with its WAL and journal files"""
+        for file_path in (path, path + "-wal", path + "-shm", path + "-journal"):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    def journal_archive_path(self, archive_path):
+        """Companion file holding the journal archive saved with a snapshot"""
+        return archive_path[:-len(self.ARCHIVE_SUFFIX)] + self.JOURNAL_ARCHIVE_SUFFIX
+
+    def snapshot(self, source_name, target_path, required_tables, progress=None):
+        """Copy, verify and compress one database file into target_path"""
+        fd, snapshot_path = tempfile.mkstemp(suffix=".db", dir=self.backup_dir)
+        os.close(fd)
+        try:
+            self.copy_database(source_name, snapshot_path, progress)
+            self.verify_database(snapshot_path, required_tables)
+
+            # Write under a temporary name so a crash never leaves a torn archive
+            partial_path = target_path + ".part"
+            with open(snapshot_path, "rb") as src, gzip.open(partial_path, "wb") as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            os.replace(partial_path, target_path)
+        finally:
+            self.remove_database(snapshot_path)
+
+    def unpack(self, archive_path, required_tables):
+        """Decompress and verify an archive into a temporary file and return its path"""
+        fd, restore_path = tempfile.mkstemp(suffix=".db", dir=os.path.dirname(os.path.abspath(archive_path)))
+        os.close(fd)
+        try:
+            try:
+                with gzip.open(archive_path, "rb") as src, open(restore_path, "wb") as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+            except (OSError, EOFError) as e:
+                raise BackupError(f"Could not read backup archive: {e}")
+            self.verify_database(restore_path, required_tables)
+        except BaseException:
+            self.remove_database(restore_path)
+            raise
+        return restore_path
+
+    def create_backup(self, progress=None):
+        """Snapshot the database into a compressed archive and return its path"""
+        with self._lock:
+            os.makedirs(self.backup_dir, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+            archive_path = os.path.join(self.backup_dir, f"{self.archive_prefix}{timestamp}{self.ARCHIVE_SUFFIX}")
+
+            self.snapshot(self.db_name, archive_path, self.REQUIRED_TABLES, progress)
+            # Taken second, so entries archived in between are at worst in both
+            # copies; the next archive run moves them out of the main database
+            if os.path.exists(self.archive_name):
+                try:
+                    self.snapshot(
+                        self.archive_name, self.journal_archive_path(archive_path), self.JOURNAL_ARCHIVE_TABLES
+                    )
+                except BaseException:
+                    os.remove(archive_path)
+                    raise
+
+            self.rotate_backups()
+            return archive_path
+
+    def list_backups(self):
+        """Archive paths, newest first"""
+        if not os.path.isdir(self.backup_dir):
+            return []
+        # "garden-" must not pick up the archives of "garden-2.db"
+        names = [
+            name for name in os.listdir(self.backup_dir)
+            if name.startswith(self.archive_prefix) and name.endswith(self.ARCHIVE_SUFFIX)
+            and self.TIMESTAMP_PATTERN.fullmatch(name[len(self.archive_prefix):-len(self.ARCHIVE_SUFFIX)])
+        ]
+        names.sort(reverse=True)
+        return [os.path.join(self.backup_dir, name) for name in names]
+
+    def rotate_backups(self):
+        """Delete archives beyond the retention count"""
+        for path in self.list_backups()[self.retention:]:
+            for file_path in (path, self.journal_archive_path(path)):
+                try:
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                except OSError as e:
+                    print(f"Error removing old backup {file_path}: {e}")
+
+    def restore_backup(self, archive_path, progress=None):
+        """Verify an archive and copy it over the live database.
+
+        The journal archive saved with it is restored too; backups taken
+        before it was saved leave the current journal archive in place.
+        """
+        with self._lock:
+            journal_path = self.journal_archive_path(archive_path)
+            restore_path = self.unpack(archive_path, self.REQUIRED_TABLES)
+            journal_restore_path = None
+            try:
+                if os.path.exists(journal_path):
+                    journal_restore_path = self.unpack(journal_path, self.JOURNAL_ARCHIVE_TABLES)
+
+                # The backup API replaces the live files under SQLite's own locking
+                self.copy_database(restore_path, self.db_name, progress)
+                if journal_restore_path is not None:
+                    self.copy_database(journal_restore_path, self.archive_name)
+            finally:
+                self.remove_database(restore_path)
+                if journal_restore_path is not None:
+                    self.remove_database(journal_restore_path)
+
+    def seconds_until_due(self, interval_seconds):
+        """Time left before the newest archive is interval_seconds old (0 if overdue)"""
+        backups = self.list_backups()
+        if not backups:
+            return 0
+        try:
+            age = time.time() - os.path.getmtime(backups[0])
+        except OSError:
+            return 0
+        return max(0, interval_seconds - age)
+
+    def start_schedule(self, interval_seconds):
+        """Take a snapshot every interval_seconds on a background thread.
+
+        The first snapshot is taken straight away when the newest archive is
+        already older than the interval, so short sessions still get one.
+        """
+        self.stop_schedule()
+        self._schedule_stop = threading.Event()
+        self._schedule_thread = threading.Thread(
+            target=self._run_schedule, args=(interval_seconds, self._schedule_stop), daemon=True
+        )
+        self._schedule_thread.start()
+
+    def stop_schedule(self):
+        if self._schedule_stop is not None:
+            self._schedule_stop.set()
+            self._schedule_thread = None
+            self._schedule_stop = None
+
+    def _run_schedule(self, interval_seconds, stop_event):
+        delay = self.seconds_until_due(interval_seconds)
+        while not stop_event.wait(delay):
+            delay = interval_seconds
+            try:
+                self.create_backup()
+            except Exception as e:
+                print(f"Error creating scheduled backup: {e}")
@@ -1,15 +1,37 @@
+import os
 import sqlite3
 from datetime import datetime, date
 
+from archive import JournalArchive, archive_name_for, archived_entry_counts
+
 class PlantDatabase:
+    # Sort keys accepted by query_plants, mapped to indexed columns
+    PLANT_SORT_KEYS = {
+        "created": "created_at",
+        "name": "name COLLATE NOCASE",
+        "date_planted": "date_planted",
+        "last_watered": "last_watered",
+    }
+
     def __init__(self, db_name="plant_tracker.db"):
         self.db_name = db_name
         self.create_tables()
 
+    def connect(self):
+        conn = sqlite3.connect(self.db_name)
+        # Off by default in SQLite; needed for ON DELETE CASCADE on journal_entries
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
     def create_tables(self):
-        with sqlite3.connect(self.db_name) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
 
+            # Lets JournalArchive hand freed pages back without a full VACUUM;
+            # only takes effect on a fresh database file, existing ones are
+            # converted by enable_incremental_vacuum
+            cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS plants (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -31,10 +53,298 @@ class PlantDatabase:
                     FOREIGN KEY (plant_id) REFERENCES plants (id) ON DELETE CASCADE
                 )
             ''')
+
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_journal_plant_date ON journal_entries (plant_id, entry_date)"
+            )
+
+            # Indexes backing the sort and filter options of query_plants
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_plants_created_at ON plants (created_at)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_plants_name ON plants (name COLLATE NOCASE)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_plants_date_planted ON plants (date_planted)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_plants_last_watered ON plants (last_watered)")
+
+            # Summary counters for the dashboard header, kept current by triggers
+            # so the list view never has to scan plants or journal_entries.
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS collection_stats (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    plant_count INTEGER NOT NULL DEFAULT 0,
+                    journal_count INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS plant_stats (
+                    plant_id INTEGER PRIMARY KEY,
+                    journal_count INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+
+            # Plants per last_watered date ('' for never watered)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS watering_stats (
+                    last_watered TEXT PRIMARY KEY,
+                    plant_count INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+
+            self.create_stats_triggers(cursor)
+
+            cursor.execute("SELECT COUNT(*) FROM collection_stats")
+            if cursor.fetchone()[0] == 0:
+                self.rebuild_stats(cursor)
+
+            # Per-day activity for the calendar view, kept current by triggers
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS daily_activity (
+                    day DATE PRIMARY KEY,
+                    watered_count INTEGER NOT NULL DEFAULT 0,
+                    journal_count INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+
+            # Which plants were involved on each day, for drill-down
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS daily_plant_activity (
+                    day DATE NOT NULL,
+                    plant_id INTEGER NOT NULL,
+                    watered INTEGER NOT NULL DEFAULT 0,
+                    journal_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (day, plant_id)
+                )
+            ''')
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_daily_plant_activity_plant ON daily_plant_activity (plant_id)"
+            )
+
+            self.create_activity_triggers(cursor)
+
+            cursor.execute("SELECT COUNT(*) FROM daily_activity")
+            if cursor.fetchone()[0] == 0:
+                self.rebuild_daily_activity(cursor)
+
             print("Database tables created successfully!")
 
+    def create_stats_triggers(self, cursor):
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS plants_stats_insert AFTER INSERT ON plants
+            BEGIN
+                UPDATE collection_stats SET plant_count = plant_count + 1 WHERE id = 1;
+                INSERT OR IGNORE INTO plant_stats (plant_id, journal_count) VALUES (NEW.id, 0);
+                INSERT OR IGNORE INTO watering_stats (last_watered, plant_count)
+                    VALUES (COALESCE(NEW.last_watered, ''), 0);
+                UPDATE watering_stats SET plant_count = plant_count + 1
+                    WHERE last_watered = COALESCE(NEW.last_watered, '');
+            END
+        ''')
+
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS plants_stats_delete AFTER DELETE ON plants
+            BEGIN
+                UPDATE collection_stats SET plant_count = plant_count - 1 WHERE id = 1;
+                DELETE FROM plant_stats WHERE plant_id = OLD.id;
+                UPDATE watering_stats SET plant_count = plant_count - 1
+                    WHERE last_watered = COALESCE(OLD.last_watered, '');
+                DELETE FROM watering_stats WHERE plant_count <= 0;
+            END
+        ''')
+
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS plants_stats_water AFTER UPDATE OF last_watered ON plants
+            WHEN COALESCE(OLD.last_watered, '') != COALESCE(NEW.last_watered, '')
+            BEGIN
+                UPDATE watering_stats SET plant_count = plant_count - 1
+                    WHERE last_watered = COALESCE(OLD.last_watered, '');
+                INSERT OR IGNORE INTO watering_stats (last_watered, plant_count)
+                    VALUES (COALESCE(NEW.last_watered, ''), 0);
+                UPDATE watering_stats SET plant_count = plant_count + 1
+                    WHERE last_watered = COALESCE(NEW.last_watered, '');
+                DELETE FROM watering_stats WHERE plant_count <= 0;
+            END
+        ''')
+
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS journal_stats_insert AFTER INSERT ON journal_entries
+            BEGIN
+                UPDATE collection_stats SET journal_count = journal_count + 1 WHERE id = 1;
+                UPDATE plant_stats SET journal_count = journal_count + 1 WHERE plant_id = NEW.plant_id;
+            END
+        ''')
+
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS journal_stats_delete AFTER DELETE ON journal_entries
+            BEGIN
+                UPDATE collection_stats SET journal_count = journal_count - 1 WHERE id = 1;
+                UPDATE plant_stats SET journal_count = journal_count - 1 WHERE plant_id = OLD.plant_id;
+            END
+        ''')
+
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS journal_stats_move AFTER UPDATE OF plant_id ON journal_entries
+            WHEN OLD.plant_id IS NOT NEW.plant_id
+            BEGIN
+                UPDATE plant_stats SET journal_count = journal_count - 1 WHERE plant_id = OLD.plant_id;
+                UPDATE plant_stats SET journal_count = journal_count + 1 WHERE plant_id = NEW.plant_id;
+            END
+        ''')
+
+    def create_activity_triggers(self, cursor):
+        watered = '''
+            INSERT OR IGNORE INTO daily_activity (day) VALUES (NEW.last_watered);
+            UPDATE daily_activity SET watered_count = watered_count + 1
+                WHERE day = NEW.last_watered AND NOT EXISTS (
+                    SELECT 1 FROM daily_plant_activity
+                    WHERE day = NEW.last_watered AND plant_id = NEW.id AND watered = 1
+                );
+            INSERT OR IGNORE INTO daily_plant_activity (day, plant_id) VALUES (NEW.last_watered, NEW.id);
+            UPDATE daily_plant_activity SET watered = 1 WHERE day = NEW.last_watered AND plant_id = NEW.id;
+        '''
+        journal_added = '''
+            INSERT OR IGNORE INTO daily_activity (day) VALUES (NEW.entry_date);
+            UPDATE daily_activity SET journal_count = journal_count + 1 WHERE day = NEW.entry_date;
+            INSERT OR IGNORE INTO daily_plant_activity (day, plant_id) VALUES (NEW.entry_date, NEW.plant_id);
+            UPDATE daily_plant_activity SET journal_count = journal_count + 1
+                WHERE day = NEW.entry_date AND plant_id = NEW.plant_id;
+        '''
+        journal_removed = '''
+            UPDATE daily_activity SET journal_count = journal_count - 1 WHERE day = OLD.entry_date;
+            UPDATE daily_plant_activity SET journal_count = journal_count - 1
+                WHERE day = OLD.entry_date AND plant_id = OLD.plant_id;
+            DELETE FROM daily_plant_activity
+                WHERE day = OLD.entry_date AND plant_id = OLD.plant_id AND watered = 0 AND journal_count <= 0;
+        '''
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS plants_activity_insert AFTER INSERT ON plants
+            WHEN NEW.last_watered IS NOT NULL
+            BEGIN {watered} END
+        ''')
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS plants_activity_water AFTER UPDATE OF last_watered ON plants
+            WHEN NEW.last_watered IS NOT NULL AND NEW.last_watered IS NOT OLD.last_watered
+            BEGIN {watered} END
+        ''')
+
+        # Journal counts of a deleted plant are removed by the cascaded journal deletes
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS plants_activity_delete AFTER DELETE ON plants
+            BEGIN
+                UPDATE daily_activity SET watered_count = watered_count - 1
+                    WHERE day IN (
+                        SELECT day FROM daily_plant_activity WHERE plant_id = OLD.id AND watered = 1
+                    );
+                DELETE FROM daily_plant_activity WHERE plant_id = OLD.id;
+            END
+        ''')
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS journal_activity_insert AFTER INSERT ON journal_entries
+            BEGIN {journal_added} END
+        ''')
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS journal_activity_delete AFTER DELETE ON journal_entries
+            BEGIN {journal_removed} END
+        ''')
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS journal_activity_update AFTER UPDATE OF entry_date, plant_id ON journal_entries
+            WHEN OLD.entry_date IS NOT NEW.entry_date OR OLD.plant_id IS NOT NEW.plant_id
+            BEGIN {journal_removed} {journal_added} END
+        ''')
+
+    def rebuild_daily_activity(self, cursor):
+        """Seed the calendar aggregates from existing rows.
+
+        Only the most recent watering of each plant is known before the
+        triggers existed.
+        """
+        cursor.execute("DELETE FROM daily_activity")
+        cursor.execute("DELETE FROM daily_plant_activity")
+        cursor.execute('''
+            INSERT INTO daily_plant_activity (day, plant_id, journal_count)
+            SELECT entry_date, plant_id, COUNT(*) FROM journal_entries
+            WHERE entry_date IS NOT NULL AND plant_id IS NOT NULL
+            GROUP BY entry_date, plant_id
+        ''')
+        # Entries already moved to the journal archive stay on the calendar
+        cursor.executemany('''
+            INSERT INTO daily_plant_activity (day, plant_id, journal_count) VALUES (?, ?, ?)
+            ON CONFLICT (day, plant_id) DO UPDATE SET journal_count = journal_count + excluded.journal_count
+        ''', self.get_archived_counts(cursor))
+        cursor.execute('''
+            INSERT OR IGNORE INTO daily_plant_activity (day, plant_id)
+            SELECT last_watered, id FROM plants WHERE last_watered IS NOT NULL
+        ''')
+        cursor.execute('''
+            UPDATE daily_plant_activity SET watered = 1
+            WHERE EXISTS (
+                SELECT 1 FROM plants p
+                WHERE p.id = daily_plant_activity.plant_id AND p.last_watered = daily_plant_activity.day
+            )
+        ''')
+        cursor.execute('''
+            INSERT INTO daily_activity (day, watered_count, journal_count)
+            SELECT day, SUM(watered), SUM(journal_count) FROM daily_plant_activity GROUP BY day
+        ''')
+
+    def rebuild_stats(self, cursor):
+        """Recompute the summary counters from scratch (used for existing databases)"""
+        cursor.execute("DELETE FROM collection_stats")
+        cursor.execute("DELETE FROM plant_stats")
+        cursor.execute("DELETE FROM watering_stats")
+        cursor.execute('''
+            INSERT INTO collection_stats (id, plant_count, journal_count)
+            VALUES (1, (SELECT COUNT(*) FROM plants), (SELECT COUNT(*) FROM journal_entries))
+        ''')
+        cursor.execute('''
+            INSERT INTO plant_stats (plant_id, journal_count)
+            SELECT p.id, (SELECT COUNT(*) FROM journal_entries j WHERE j.plant_id = p.id)
+            FROM plants p
+        ''')
+        cursor.execute('''
+            INSERT INTO watering_stats (last_watered, plant_count)
+            SELECT COALESCE(last_watered, ''), COUNT(*) FROM plants
+            GROUP BY COALESCE(last_watered, '')
+        ''')
+
+        # Archived entries still count towards the totals
+        for day, plant_id, count in self.get_archived_counts(cursor):
+            cursor.execute("UPDATE collection_stats SET journal_count = journal_count + ? WHERE id = 1", (count,))
+            cursor.execute(
+                "UPDATE plant_stats SET journal_count = journal_count + ? WHERE plant_id = ?", (count, plant_id)
+            )
+
+    def get_archived_counts(self, cursor):
+        """(entry_date, plant_id, count) of archived journal entries whose plant still exists"""
+        cursor.execute("SELECT id FROM plants")
+        plant_ids = {row[0] for row in cursor.fetchall()}
+        return [
+            row for row in archived_entry_counts(archive_name_for(self.db_name))
+            if row[1] in plant_ids
+        ]
+
+    def enable_incremental_vacuum(self):
+        """Convert a database created before incremental auto-vacuum.
+
+        This is a one-time full VACUUM that rewrites the whole file, so call
+        it at startup before other connections are open. Returns True if
+        the file was converted.
+        """
+        conn = self.connect()
+        try:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                return False
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+            return True
+        finally:
+            conn.close()
+
     def execute_query(self, query, params=(), fetch=False, fetchall=False):
-        with sqlite3.connect(self.db_name) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
 
@@ -53,10 +363,58 @@ class PlantDatabase:
         )
 
     def get_all_plants(self):
-        return self.execute_query(
-            "SELECT id, name, date_planted, care_plan, last_watered, created_at FROM plants ORDER BY created_at DESC",
-            fetchall=True
-        )
+        return self.query_plants()
+
+    def query_plants(self, sort_by="created", descending=True, name_prefix="",
+                     needs_watering=False, limit=None):
+        """Fetch plants sorted and filtered in SQL.
+
+        sort_by is one of PLANT_SORT_KEYS; name_prefix matches case-insensitively
+        and needs_watering keeps only plants not watered today.
+        """
+        if sort_by not in self.PLANT_SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort_by}")
+
+        conditions = []
+        params = []
+
+        if name_prefix:
+            # Range scan instead of LIKE so the NOCASE name index is used.
+            # NOCASE folds ASCII letters to lower case, so build the bounds from
+            # the folded prefix ('Z' + 1 would be '[', which sorts before 'z').
+            prefix = "".join(c.lower() if "A" <= c <= "Z" else c for c in name_prefix)
+            conditions.append("name >= ? COLLATE NOCASE")
+            params.append(prefix)
+
+            # The upper bound bumps the last character that has a successor
+            upper = prefix.rstrip(chr(0x10FFFF))
+            if upper:
+                last = ord(upper[-1]) + 1
+                if 0xD800 <= last <= 0xDFFF:
+                    last = 0xE000  # Skip surrogates, which cannot be bound as text
+                elif ord("A") <= last <= ord("Z"):
+                    # NOCASE would fold the bound to lower case and widen the range;
+                    # folded names never hold A-Z, so '[' bounds the same names
+                    last = ord("[")
+                conditions.append("name < ? COLLATE NOCASE")
+                params.append(upper[:-1] + chr(last))
+
+        if needs_watering:
+            conditions.append("(last_watered IS NULL OR last_watered < ?)")
+            params.append(date.today().isoformat())
+
+        query = "SELECT id, name, date_planted, care_plan, last_watered, created_at FROM plants"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        direction = "DESC" if descending else "ASC"
+        query += f" ORDER BY {self.PLANT_SORT_KEYS[sort_by]} {direction}, id {direction}"
+
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(int(limit))
+
+        return self.execute_query(query, tuple(params), fetchall=True)
 
     def add_journal_entry(self, plant_id, entry_date, notes):
         return self.execute_query(
@@ -78,13 +436,35 @@ class PlantDatabase:
 
     def delete_plant(self, plant_id):
         try:
-            self.execute_query("DELETE FROM journal_entries WHERE plant_id = ?", (plant_id,))
+            # Journal entries go with the plant through ON DELETE CASCADE
             self.execute_query("DELETE FROM plants WHERE id = ?", (plant_id,))
+            self.delete_archived_entries([plant_id])
             return True
         except Exception as e:
             print(f"Error deleting plant: {e}")
             return False
 
+    def delete_plants(self, plant_ids):
+        """Delete many plants and their journal entries in a single transaction"""
+        plant_ids = list(plant_ids)
+        try:
+            with self.connect() as conn:
+                for start in range(0, len(plant_ids), 500):
+                    chunk = plant_ids[start:start + 500]
+                    placeholders = ", ".join("?" for _ in chunk)
+                    conn.execute(f"DELETE FROM plants WHERE id IN ({placeholders})", tuple(chunk))
+            self.delete_archived_entries(plant_ids)
+            return True
+        except Exception as e:
+            print(f"Error deleting plants: {e}")
+            return False
+
+    def delete_archived_entries(self, plant_ids):
+        """Drop archived journal entries of deleted plants and take them out of the counters"""
+        if not os.path.exists(archive_name_for(self.db_name)):
+            return True
+        return JournalArchive(self.db_name).delete_plant_entries(plant_ids)
+
     def delete_journal_entry(self, entry_id):
         try:
             self.execute_query("DELETE FROM journal_entries WHERE id = ?", (entry_id,))
@@ -128,6 +508,64 @@ class PlantDatabase:
             print(f"Error watering plant: {e}")
             return False
 
+    def get_dashboard_stats(self):
+        """Collection totals for the list header, read from the trigger-maintained counters"""
+        today = date.today().isoformat()
+        plant_count, journal_count = self.execute_query(
+            "SELECT plant_count, journal_count FROM collection_stats WHERE id = 1",
+            fetch=True
+        ) or (0, 0)
+        watered = self.execute_query(
+            "SELECT COALESCE(SUM(plant_count), 0) FROM watering_stats WHERE last_watered >= ?",
+            (today,), fetch=True
+        )[0]
+        return {
+            "total_plants": plant_count,
+            "due_today": plant_count - watered,
+            "journal_entries": journal_count,
+        }
+
+    def get_journal_counts(self, plant_ids=None):
+        """Map of plant_id -> number of journal entries, optionally for the given plants only"""
+        if plant_ids is None:
+            rows = self.execute_query(
+                "SELECT plant_id, journal_count FROM plant_stats",
+                fetchall=True
+            )
+            return dict(rows)
+
+        counts = {}
+        plant_ids = list(plant_ids)
+        # Stay well below SQLite's bound parameter limit
+        for start in range(0, len(plant_ids), 500):
+            chunk = plant_ids[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = self.execute_query(
+                f"SELECT plant_id, journal_count FROM plant_stats WHERE plant_id IN ({placeholders})",
+                tuple(chunk), fetchall=True
+            )
+            counts.update(rows)
+        return counts
+
+    def get_daily_activity(self, start_date, end_date):
+        """Map of day -> (plants watered, journal entries) between two ISO dates, inclusive"""
+        rows = self.execute_query(
+            "SELECT day, watered_count, journal_count FROM daily_activity WHERE day BETWEEN ? AND ?",
+            (start_date, end_date), fetchall=True
+        )
+        return {day: (watered, journals) for day, watered, journals in rows}
+
+    def get_day_activity(self, day):
+        """Plants watered or written about on a day, as (plant, watered, journal_count)"""
+        rows = self.execute_query(
+            '''SELECT p.id, p.name, p.date_planted, p.care_plan, p.last_watered, p.created_at,
+                      d.watered, d.journal_count
+               FROM daily_plant_activity d JOIN plants p ON p.id = d.plant_id
+               WHERE d.day = ? ORDER BY p.name COLLATE NOCASE''',
+            (day,), fetchall=True
+        )
+        return [(row[:6], bool(row[6]), row[7]) for row in rows]
+
     def needs_watering(self, plant):
         """Check if plant needs watering (not watered today)"""
         plant_id, name, date_planted, care_plan, last_watered, created_at = plant
@@ -0,0 +1,91 @@
+"""Navigate through every view repeatedly and check that widget count and RSS stay flat.
+
+Run with: QT_QPA_PLATFORM=offscreen python leak_check.py [cycles]
+"""
+import os
+import sys
+import tempfile
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QCoreApplication, QEvent
+from GUI import MainWindow
+
+WIDGET_TOLERANCE = 0
+RSS_TOLERANCE_KB = 8 * 1024
+
+
+def rss_kb():
+    """Resident set size in KB, or None where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def settle(app):
+    """Run pending events and flush widgets scheduled with deleteLater"""
+    app.processEvents()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    app.processEvents()
+
+
+def seed(window, plant_count=30, entries_per_plant=5):
+    for i in range(plant_count):
+        plant_id = window.db.add_plant(f"Plant {i}", "2024-01-01", "Water weekly")
+        for j in range(entries_per_plant):
+            window.db.add_journal_entry(plant_id, f"2025-01-{j + 1:02d}", f"Note {j}")
+    window.plant_list_dirty = True
+    window.show_plant_list()
+
+
+def navigate(window):
+    plant = window.db.get_all_plants()[0]
+    window.show_plant_details(plant)
+    window.show_add_journal_form(plant[0])
+    window.view_stack.setCurrentWidget(window.plant_details_view)
+    window.show_plant_list()
+    window.show_add_plant_form()
+    window.show_edit_plant_form(plant)
+    window.show_calendar()
+    window.show_plant_list()
+    # Force a re-query as well, as after any edit
+    window.plant_list_dirty = True
+    window.show_plant_list()
+
+
+def main():
+    cycles = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    app = QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        window = MainWindow(os.path.join(temp_dir, "leak_check.db"))
+        seed(window)
+
+        # Warm up caches before taking the baseline
+        for _ in range(20):
+            navigate(window)
+        settle(app)
+        widgets_before, rss_before = len(app.allWidgets()), rss_kb()
+
+        for _ in range(cycles):
+            navigate(window)
+            settle(app)
+        widgets_after, rss_after = len(app.allWidgets()), rss_kb()
+
+        window.close()
+
+    print(f"Widgets: {widgets_before} -> {widgets_after}")
+    if rss_before is not None:
+        print(f"RSS: {rss_before} KB -> {rss_after} KB")
+
+    leaked = widgets_after - widgets_before > WIDGET_TOLERANCE
+    if rss_before is not None and rss_after - rss_before > RSS_TOLERANCE_KB:
+        leaked = True
+    print("Leak detected!" if leaked else "No leak detected.")
+    return 1 if leaked else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
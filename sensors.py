@@ -0,0 +1,367 @@
+import argparse
+import csv
+import os
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from database import PlantDatabase
+
+
+class RingBuffer:
+    """Fixed-size, thread-safe reading buffer.
+
+    Live producers overwrite the oldest readings when the writer falls
+    behind; file imports pass block=True and wait for space instead. Once
+    closed, pushes are refused so nobody waits on a writer that is gone.
+    """
+
+    def __init__(self, capacity):
+        self.items = deque(maxlen=capacity)
+        self.not_full = threading.Condition()
+        self.dropped = 0
+        self.closed = False
+
+    def push(self, item, block=False):
+        """Add a reading; returns False if the buffer is closed"""
+        with self.not_full:
+            if block:
+                while len(self.items) == self.items.maxlen and not self.closed:
+                    self.not_full.wait()
+            if self.closed:
+                self.dropped += 1
+                return False
+            if len(self.items) == self.items.maxlen:
+                self.dropped += 1
+            self.items.append(item)
+            return True
+
+    def open(self):
+        with self.not_full:
+            self.closed = False
+
+    def close(self):
+        """Refuse further readings and wake producers waiting for space"""
+        with self.not_full:
+            self.closed = True
+            self.not_full.notify_all()
+
+    def drain(self, limit):
+        with self.not_full:
+            count = min(limit, len(self.items))
+            batch = [self.items.popleft() for _ in range(count)]
+            if batch:
+                self.not_full.notify_all()
+            return batch
+
+    def __len__(self):
+        with self.not_full:
+            return len(self.items)
+
+
+class SensorStore:
+    """Raw sensor readings plus minute/hour/day rollups in the plant database"""
+
+    RESOLUTIONS = {"minute": 60, "hour": 3600, "day": 86400}
+    # Seconds each tier is kept; None keeps it forever
+    RETENTION = {"raw": 24 * 3600, "minute": 7 * 86400, "hour": 365 * 86400, "day": None}
+
+    def __init__(self, db):
+        self.db = db
+        self.create_tables()
+
+    def create_tables(self):
+        with self.db.connect() as conn:
+            cursor = conn.cursor()
+
+            # Readers (the GUI chart) never wait on the ingest writer in WAL mode
+            cursor.execute("PRAGMA journal_mode = WAL")
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sensor_readings (
+                    plant_id INTEGER NOT NULL,
+                    sensor TEXT NOT NULL,
+                    ts REAL NOT NULL,
+                    value REAL NOT NULL,
+                    FOREIGN KEY (plant_id) REFERENCES plants (id) ON DELETE CASCADE
+                )
+            ''')
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sensor_readings_plant ON sensor_readings (plant_id, sensor, ts)"
+            )
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sensor_readings_ts ON sensor_readings (ts)")
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sensor_rollups (
+                    plant_id INTEGER NOT NULL,
+                    sensor TEXT NOT NULL,
+                    resolution INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    count INTEGER NOT NULL,
+                    total REAL NOT NULL,
+                    min_value REAL NOT NULL,
+                    max_value REAL NOT NULL,
+                    PRIMARY KEY (plant_id, sensor, resolution, bucket),
+                    FOREIGN KEY (plant_id) REFERENCES plants (id) ON DELETE CASCADE
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sensor_rollups_age ON sensor_rollups (resolution, bucket)"
+            )
+
+    def write_batch(self, conn, readings):
+        """Store readings and fold them into every rollup in one transaction.
+
+        readings are (plant_id, sensor, ts, value); unknown plants are skipped.
+        Returns the number of readings stored.
+        """
+        plant_ids = list({reading[0] for reading in readings})
+        known = set()
+        for start in range(0, len(plant_ids), 500):
+            chunk = plant_ids[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            known.update(
+                row[0] for row in conn.execute(f"SELECT id FROM plants WHERE id IN ({placeholders})", chunk)
+            )
+        readings = [reading for reading in readings if reading[0] in known]
+        if not readings:
+            return 0
+
+        # Pre-aggregate in Python so each bucket costs one upsert per batch
+        rollups = {}
+        for plant_id, sensor, ts, value in readings:
+            for resolution in self.RESOLUTIONS.values():
+                key = (plant_id, sensor, resolution, int(ts // resolution) * resolution)
+                current = rollups.get(key)
+                if current is None:
+                    rollups[key] = [1, value, value, value]
+                else:
+                    current[0] += 1
+                    current[1] += value
+                    current[2] = min(current[2], value)
+                    current[3] = max(current[3], value)
+
+        with conn:
+            conn.executemany(
+                "INSERT INTO sensor_readings (plant_id, sensor, ts, value) VALUES (?, ?, ?, ?)", readings
+            )
+            conn.executemany('''
+                INSERT INTO sensor_rollups
+                    (plant_id, sensor, resolution, bucket, count, total, min_value, max_value)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (plant_id, sensor, resolution, bucket) DO UPDATE SET
+                    count = count + excluded.count,
+                    total = total + excluded.total,
+                    min_value = MIN(min_value, excluded.min_value),
+                    max_value = MAX(max_value, excluded.max_value)
+            ''', [key + tuple(values) for key, values in rollups.items()])
+        return len(readings)
+
+    def prune(self, conn, now=None):
+        """Drop raw readings and rollups older than their retention"""
+        now = now or time.time()
+        with conn:
+            if self.RETENTION["raw"] is not None:
+                conn.execute("DELETE FROM sensor_readings WHERE ts < ?", (now - self.RETENTION["raw"],))
+            for name, resolution in self.RESOLUTIONS.items():
+                if self.RETENTION[name] is not None:
+                    conn.execute(
+                        "DELETE FROM sensor_rollups WHERE resolution = ? AND bucket < ?",
+                        (resolution, now - self.RETENTION[name])
+                    )
+
+    def get_sensors(self, plant_id):
+        rows = self.db.execute_query(
+            "SELECT DISTINCT sensor FROM sensor_rollups WHERE plant_id = ? AND resolution = ? ORDER BY sensor",
+            (plant_id, self.RESOLUTIONS["day"]), fetchall=True
+        )
+        return [row[0] for row in rows]
+
+    def get_rollups(self, plant_id, sensor, resolution, since):
+        """(bucket, average, min, max) rows at a resolution name, oldest first"""
+        return self.db.execute_query('''
+            SELECT bucket, total / count, min_value, max_value FROM sensor_rollups
+            WHERE plant_id = ? AND sensor = ? AND resolution = ? AND bucket >= ?
+            ORDER BY bucket
+        ''', (plant_id, sensor, self.RESOLUTIONS[resolution], since), fetchall=True)
+
+
+def parse_timestamp(text):
+    if not text:
+        return time.time()
+    try:
+        return float(text)
+    except ValueError:
+        return datetime.fromisoformat(text).timestamp()
+
+
+def parse_reading(fields):
+    """plant_id,sensor,value[,timestamp] -> (plant_id, sensor, ts, value)"""
+    plant_id, sensor, value = int(fields[0]), fields[1].strip(), float(fields[2])
+    ts = parse_timestamp(fields[3].strip() if len(fields) > 3 else "")
+    return plant_id, sensor, ts, value
+
+
+class SensorIngestor:
+    """Buffered sensor ingestion from CSV files, streams and a UNIX socket.
+
+    Reader threads parse lines into a ring buffer; a single writer thread
+    drains it in batches, each written in one transaction.
+    """
+
+    def __init__(self, db, capacity=65536, batch_size=5000, flush_interval=0.5, prune_interval=300):
+        self.db = db
+        self.store = SensorStore(db)
+        self.buffer = RingBuffer(capacity)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.prune_interval = prune_interval
+        self.stored = 0
+        self.rejected = 0
+        self._stop = threading.Event()
+        self._writer = None
+        self._server = None
+        self._socket_path = None
+
+    def start(self):
+        self._stop.clear()
+        self.buffer.open()
+        self._writer = threading.Thread(target=self._run_writer, daemon=True)
+        self._writer.start()
+
+    def stop(self):
+        """Stop listening, flush what is buffered and wait for the writer"""
+        self._stop.set()
+        self.buffer.close()
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            try:
+                os.remove(self._socket_path)
+            except OSError:
+                pass
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+
+    def _run_writer(self):
+        conn = self.db.connect()
+        last_prune = time.monotonic()
+        try:
+            while True:
+                batch = self.buffer.drain(self.batch_size)
+                if batch:
+                    try:
+                        self.stored += self.store.write_batch(conn, batch)
+                    except Exception as e:
+                        print(f"Error writing sensor readings: {e}")
+                elif self._stop.is_set():
+                    break
+                else:
+                    self._stop.wait(self.flush_interval)
+
+                if time.monotonic() - last_prune >= self.prune_interval:
+                    try:
+                        self.store.prune(conn)
+                    except Exception as e:
+                        print(f"Error pruning sensor readings: {e}")
+                    last_prune = time.monotonic()
+        finally:
+            # Nothing drains the buffer any more; release blocked producers
+            self.buffer.close()
+            conn.close()
+
+    def ingest_lines(self, lines, block=True):
+        """Parse CSV lines into the buffer; a header row or bad lines are rejected.
+
+        Stops early once the ingestor is stopped or its writer has exited.
+        """
+        for fields in csv.reader(lines):
+            if not fields or fields[0].startswith("#"):
+                continue
+            try:
+                reading = parse_reading(fields)
+            except (ValueError, IndexError):
+                self.rejected += 1
+                continue
+            if not self.buffer.push(reading, block):
+                return
+
+    def ingest_file(self, path):
+        with open(path, newline="") as f:
+            self.ingest_lines(f)
+
+    def ingest_stream(self, stream=None):
+        self.ingest_lines(stream or sys.stdin)
+
+    def serve_socket(self, path):
+        """Accept newline-separated CSV readings on a local UNIX socket"""
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("UNIX sockets are not supported on this platform")
+        if os.path.exists(path):
+            # Only clear a stale socket file; never take one over from a running ingestor
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.remove(path)
+            else:
+                raise OSError(f"Another process is already listening on {path}")
+            finally:
+                probe.close()
+
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(path)
+        self._server.listen()
+        self._socket_path = path
+        threading.Thread(target=self._accept_clients, args=(self._server,), daemon=True).start()
+
+    def _accept_clients(self, server):
+        while not self._stop.is_set():
+            try:
+                client, _ = server.accept()
+            except OSError:
+                break
+            threading.Thread(target=self._read_client, args=(client,), daemon=True).start()
+
+    def _read_client(self, client):
+        with client, client.makefile("r", encoding="utf-8", newline="") as stream:
+            # Live probes: keep the newest readings rather than stall the sender
+            self.ingest_lines(stream, block=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest sensor readings into the plant tracker database")
+    parser.add_argument("--db", default="plant_tracker.db")
+    parser.add_argument("--csv", nargs="*", default=[], help="CSV files of plant_id,sensor,value[,timestamp]")
+    parser.add_argument("--stdin", action="store_true", help="read readings from standard input")
+    parser.add_argument("--socket", help="listen for readings on this UNIX socket path")
+    args = parser.parse_args()
+
+    ingestor = SensorIngestor(PlantDatabase(args.db))
+    ingestor.start()
+    try:
+        for path in args.csv:
+            ingestor.ingest_file(path)
+        if args.stdin:
+            ingestor.ingest_stream()
+        if args.socket:
+            ingestor.serve_socket(args.socket)
+            print(f"Listening for readings on {args.socket} (Ctrl+C to stop)")
+            while True:
+                time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Error opening sensor socket: {e}")
+    finally:
+        ingestor.stop()
+
+    print(f"Stored {ingestor.stored} readings, rejected {ingestor.rejected}, dropped {ingestor.buffer.dropped}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+import argparse
+import gzip
+import json
+import os
+import sqlite3
+import sys
+import uuid
+
+from database import PlantDatabase
+
+
+class SyncError(Exception):
+    pass
+
+
+class SyncEngine:
+    """Two-way sync between plant_tracker.db replicas.
+
+    Triggers record the latest version of every plants and journal_entries
+    row in sync_log, stamped with (counter, replica) from a Lamport clock.
+    Each replica keeps a version vector of the highest counter it has seen
+    from every other replica, so an exchange only carries rows the other
+    side has not seen. Concurrent edits resolve deterministically: the
+    higher (counter, replica) stamp wins, deletes included.
+
+    A database copied by hand shares its replica id with the original; use
+    clone_replica to create a second replica instead.
+    """
+
+    FORMAT_VERSION = 1
+    TABLES = ("plants", "journal_entries")
+    PLANT_COLUMNS = ("name", "date_planted", "care_plan", "last_watered", "created_at")
+    JOURNAL_COLUMNS = ("entry_date", "notes", "created_at")
+
+    def __init__(self, db):
+        self.db = db
+        self.create_tables()
+
+    def create_tables(self):
+        with self.db.connect() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sync_meta (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    replica TEXT NOT NULL,
+                    clock INTEGER NOT NULL DEFAULT 0,
+                    applying INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+
+            # Latest version of every synced row; tombstones keep row_id NULL
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sync_log (
+                    uid TEXT PRIMARY KEY,
+                    table_name TEXT NOT NULL,
+                    row_id INTEGER,
+                    replica TEXT NOT NULL,
+                    counter INTEGER NOT NULL,
+                    deleted INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+            cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_sync_log_row ON sync_log (table_name, row_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sync_log_version ON sync_log (replica, counter)")
+
+            # Highest counter seen from each other replica
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sync_vector (
+                    replica TEXT PRIMARY KEY,
+                    counter INTEGER NOT NULL
+                )
+            ''')
+
+            # Version vector each peer reported at the last exchange
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sync_peers (
+                    replica TEXT PRIMARY KEY,
+                    vector TEXT NOT NULL
+                )
+            ''')
+
+            for table in self.TABLES:
+                self.create_sync_triggers(cursor, table)
+
+            cursor.execute("SELECT COUNT(*) FROM sync_meta")
+            if cursor.fetchone()[0] == 0:
+                cursor.execute("INSERT INTO sync_meta (id, replica, clock) VALUES (1, ?, 0)", (uuid.uuid4().hex,))
+                self.track_existing_rows(cursor)
+
+    def create_sync_triggers(self, cursor, table):
+        stamp = f'''
+            UPDATE sync_meta SET clock = clock + 1 WHERE id = 1;
+            INSERT OR REPLACE INTO sync_log (uid, table_name, row_id, replica, counter, deleted)
+            SELECT COALESCE(
+                       (SELECT uid FROM sync_log WHERE table_name = '{table}' AND row_id = {{row}}.id),
+                       replica || ':{table}:' || {{row}}.id
+                   ),
+                   '{table}', {{row_id}}, replica, clock, {{deleted}}
+            FROM sync_meta WHERE id = 1;
+        '''
+        when = "WHEN (SELECT applying FROM sync_meta WHERE id = 1) = 0"
+
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_sync_insert AFTER INSERT ON {table} {when}
+            BEGIN {stamp.format(row="NEW", row_id="NEW.id", deleted=0)} END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_sync_update AFTER UPDATE ON {table} {when}
+            BEGIN {stamp.format(row="NEW", row_id="NEW.id", deleted=0)} END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_sync_delete AFTER DELETE ON {table} {when}
+            BEGIN {stamp.format(row="OLD", row_id="NULL", deleted=1)} END
+        ''')
+
+    def track_existing_rows(self, cursor):
+        """Stamp rows that predate sync so the first exchange carries them"""
+        replica = self.get_replica_id(cursor)
+        cursor.execute("UPDATE sync_meta SET clock = 1 WHERE id = 1")
+        for table in self.TABLES:
+            cursor.execute(f'''
+                INSERT OR IGNORE INTO sync_log (uid, table_name, row_id, replica, counter, deleted)
+                SELECT ? || ':{table}:' || id, '{table}', id, ?, 1, 0 FROM {table}
+            ''', (replica, replica))
+
+    def get_replica_id(self, cursor=None):
+        if cursor is None:
+            return self.db.execute_query("SELECT replica FROM sync_meta WHERE id = 1", fetch=True)[0]
+        cursor.execute("SELECT replica FROM sync_meta WHERE id = 1")
+        return cursor.fetchone()[0]
+
+    def get_version_vector(self, cursor=None):
+        """Highest counter seen per replica, including this one"""
+        if cursor is None:
+            with self.db.connect() as conn:
+                return self.get_version_vector(conn.cursor())
+        cursor.execute("SELECT replica, counter FROM sync_vector")
+        vector = dict(cursor.fetchall())
+        cursor.execute("SELECT replica, clock FROM sync_meta WHERE id = 1")
+        replica, clock = cursor.fetchone()
+        vector[replica] = clock
+        return vector
+
+    def get_peer_vector(self, peer_replica):
+        row = self.db.execute_query(
+            "SELECT vector FROM sync_peers WHERE replica = ?", (peer_replica,), fetch=True
+        )
+        return json.loads(row[0]) if row else {}
+
+    def get_peers(self):
+        """Replica ids this database has exchanged changes with"""
+        rows = self.db.execute_query("SELECT replica FROM sync_peers ORDER BY replica", fetchall=True)
+        return [row[0] for row in rows]
+
+    def changes_since(self, since=None):
+        """Rows changed after the given version vector, plants before journal entries"""
+        since = since or {}
+        changes = []
+
+        with self.db.connect() as conn:
+            cursor = conn.cursor()
+            for replica in self.get_version_vector(cursor):
+                cursor.execute('''
+                    SELECT uid, table_name, row_id, replica, counter, deleted FROM sync_log
+                    WHERE replica = ? AND counter > ?
+                ''', (replica, since.get(replica, 0)))
+
+                for uid, table, row_id, origin, counter, deleted in cursor.fetchall():
+                    change = {"uid": uid, "table": table, "replica": origin, "counter": counter, "deleted": deleted}
+                    if not deleted:
+                        data = self.read_row(conn, table, row_id)
+                        if data is None:
+                            continue
+                        change["data"] = data
+                    changes.append(change)
+
+        changes.sort(key=lambda change: (self.TABLES.index(change["table"]), change["counter"]))
+        return changes
+
+    def read_row(self, conn, table, row_id):
+        if table == "plants":
+            row = conn.execute(
+                f"SELECT {', '.join(self.PLANT_COLUMNS)} FROM plants WHERE id = ?", (row_id,)
+            ).fetchone()
+            return dict(zip(self.PLANT_COLUMNS, row)) if row else None
+
+        row = conn.execute(f'''
+            SELECT {', '.join('j.' + column for column in self.JOURNAL_COLUMNS)}, s.uid
+            FROM journal_entries j
+            JOIN sync_log s ON s.table_name = 'plants' AND s.row_id = j.plant_id
+            WHERE j.id = ?
+        ''', (row_id,)).fetchone()
+        if row is None:
+            return None
+        data = dict(zip(self.JOURNAL_COLUMNS, row))
+        data["plant"] = row[-1]
+        return data
+
+    def apply_changes(self, changes, peer_replica=None, peer_vector=None):
+        """Merge changes from another replica; returns how many rows were applied"""
+        applied = 0
+        deleted_plants = []
+
+        with self.db.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("UPDATE sync_meta SET applying = 1 WHERE id = 1")
+
+            for change in changes:
+                if self.apply_change(cursor, change, deleted_plants):
+                    applied += 1
+
+            vector = dict(peer_vector or {})
+            for change in changes:
+                vector[change["replica"]] = max(vector.get(change["replica"], 0), change["counter"])
+
+            own_replica = self.get_replica_id(cursor)
+            for replica, counter in vector.items():
+                if replica == own_replica:
+                    continue
+                cursor.execute("INSERT OR IGNORE INTO sync_vector (replica, counter) VALUES (?, 0)", (replica,))
+                cursor.execute(
+                    "UPDATE sync_vector SET counter = MAX(counter, ?) WHERE replica = ?", (counter, replica)
+                )
+
+            # Lamport clock: local edits must stamp above everything seen so far
+            highest = max(vector.values(), default=0)
+            cursor.execute("UPDATE sync_meta SET clock = MAX(clock, ?), applying = 0 WHERE id = 1", (highest,))
+
+            if peer_replica is not None and peer_vector is not None:
+                cursor.execute(
+                    "INSERT OR REPLACE INTO sync_peers (replica, vector) VALUES (?, ?)",
+                    (peer_replica, json.dumps(peer_vector))
+                )
+
+        if deleted_plants:
+            # Same clean-up as a local delete: archived entries and their counts
+            self.db.delete_archived_entries(deleted_plants)
+        return applied
+
+    def apply_change(self, cursor, change, deleted_plants=None):
+        """Apply one change if it is newer than the local row.
+
+        Ids of plants deleted here are appended to deleted_plants.
+        """
+        uid, table = change["uid"], change["table"]
+        if table not in self.TABLES:
+            raise SyncError(f"Unknown table in change set: {table}")
+
+        cursor.execute("SELECT row_id, replica, counter FROM sync_log WHERE uid = ?", (uid,))
+        local = cursor.fetchone()
+        row_id = None
+        if local is not None:
+            row_id, local_replica, local_counter = local
+            if (local_counter, local_replica) >= (change["counter"], change["replica"]):
+                return False
+
+        if change["deleted"]:
+            if row_id is not None:
+                if table == "plants":
+                    # Journal rows go with the plant through the cascade; tombstone them too
+                    cursor.execute('''
+                        UPDATE sync_log SET row_id = NULL, deleted = 1
+                        WHERE table_name = 'journal_entries'
+                          AND row_id IN (SELECT id FROM journal_entries WHERE plant_id = ?)
+                    ''', (row_id,))
+                cursor.execute(f"DELETE FROM {table} WHERE id = ?", (row_id,))
+                if table == "plants" and deleted_plants is not None:
+                    deleted_plants.append(row_id)
+            self.write_log(cursor, change, None)
+            return True
+
+        data = change["data"]
+        if table == "plants":
+            columns, values = self.PLANT_COLUMNS, [data[column] for column in self.PLANT_COLUMNS]
+        else:
+            cursor.execute(
+                "SELECT row_id FROM sync_log WHERE uid = ? AND deleted = 0", (data["plant"],)
+            )
+            plant = cursor.fetchone()
+            if plant is None:
+                # The plant was deleted here; the entry went with it
+                self.write_log(cursor, dict(change, deleted=1), None)
+                return False
+            columns = ("plant_id",) + self.JOURNAL_COLUMNS
+            values = [plant[0]] + [data[column] for column in self.JOURNAL_COLUMNS]
+
+        if row_id is not None:
+            assignments = ", ".join(f"{column} = ?" for column in columns)
+            cursor.execute(f"UPDATE {table} SET {assignments} WHERE id = ?", (*values, row_id))
+        else:
+            placeholders = ", ".join("?" for _ in columns)
+            cursor.execute(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", values)
+            row_id = cursor.lastrowid
+
+        self.write_log(cursor, change, row_id)
+        return True
+
+    def write_log(self, cursor, change, row_id):
+        cursor.execute('''
+            INSERT OR REPLACE INTO sync_log (uid, table_name, row_id, replica, counter, deleted)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (change["uid"], change["table"], row_id, change["replica"], change["counter"], change["deleted"]))
+
+    def export_changes(self, path, peer_replica=None):
+        """Write a compressed change file holding what peer_replica has not seen.
+
+        Without a peer (or for a peer never synced with) every row is exported.
+        Returns the number of changes written.
+        """
+        since = self.get_peer_vector(peer_replica) if peer_replica else {}
+        changes = self.changes_since(since)
+        payload = {
+            "format": self.FORMAT_VERSION,
+            "replica": self.get_replica_id(),
+            "vector": self.get_version_vector(),
+            "changes": changes,
+        }
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        return len(changes)
+
+    def import_changes(self, path):
+        """Apply a change file; returns (sender replica id, rows applied)"""
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, EOFError, ValueError) as e:
+            raise SyncError(f"Could not read change file: {e}")
+
+        if payload.get("format") != self.FORMAT_VERSION:
+            raise SyncError(f"Unsupported change file format: {payload.get('format')}")
+        if payload["replica"] == self.get_replica_id():
+            raise SyncError("Change file was written by this replica")
+
+        applied = self.apply_changes(payload["changes"], payload["replica"], payload["vector"])
+        return payload["replica"], applied
+
+    def sync_with(self, other):
+        """Exchange deltas with another local replica in both directions.
+
+        Returns (rows applied here, rows applied there).
+        """
+        own_replica, other_replica = self.get_replica_id(), other.get_replica_id()
+        if own_replica == other_replica:
+            raise SyncError("Both databases share a replica id; create copies with clone_replica")
+
+        own_vector, other_vector = self.get_version_vector(), other.get_version_vector()
+        outgoing = self.changes_since(other_vector)
+        incoming = other.changes_since(own_vector)
+
+        applied_there = other.apply_changes(outgoing, own_replica, own_vector)
+        applied_here = self.apply_changes(incoming, other_replica, other_vector)
+        return applied_here, applied_there
+
+    def clone_replica(self, target_name):
+        """Copy this database to target_name as a new replica"""
+        target = sqlite3.connect(target_name)
+        source = self.db.connect()
+        try:
+            source.backup(target)
+            replica, clock = source.execute("SELECT replica, clock FROM sync_meta WHERE id = 1").fetchone()
+            vector = json.dumps(self.get_version_vector(source.cursor()))
+            clone_replica = uuid.uuid4().hex
+            with target:
+                # The copy has already seen everything the original wrote
+                target.execute("INSERT OR REPLACE INTO sync_vector (replica, counter) VALUES (?, ?)", (replica, clock))
+                target.execute("UPDATE sync_meta SET replica = ? WHERE id = 1", (clone_replica,))
+                target.execute("DELETE FROM sync_peers")
+                # Both sides start out in step, so the first export only carries new edits
+                target.execute("INSERT INTO sync_peers (replica, vector) VALUES (?, ?)", (replica, vector))
+            with source:
+                source.execute(
+                    "INSERT OR REPLACE INTO sync_peers (replica, vector) VALUES (?, ?)", (clone_replica, vector)
+                )
+        finally:
+            source.close()
+            target.close()
+        return SyncEngine(PlantDatabase(target_name))
+
+
+def sync_databases(first_name, second_name):
+    """Two-way sync between two plant tracker database files"""
+    first = SyncEngine(PlantDatabase(first_name))
+    second = SyncEngine(PlantDatabase(second_name))
+    return first.sync_with(second)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync plant tracker databases between replicas")
+    parser.add_argument("--db", default="plant_tracker.db")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="write the changes a peer has not seen to a file")
+    export_parser.add_argument("path")
+    export_parser.add_argument(
+        "--peer", help="replica id of the receiving database (default: the only peer synced with so far)"
+    )
+    export_parser.add_argument("--all", action="store_true", help="export every row, e.g. for a new peer")
+
+    import_parser = commands.add_parser("import", help="apply a change file written by another replica")
+    import_parser.add_argument("path")
+
+    sync_parser = commands.add_parser("sync", help="two-way sync with another database file")
+    sync_parser.add_argument("other")
+
+    clone_parser = commands.add_parser("clone", help="copy the database as a new replica to sync with")
+    clone_parser.add_argument("target")
+
+    args = parser.parse_args()
+
+    engine = SyncEngine(PlantDatabase(args.db))
+    try:
+        if args.command == "export":
+            peer = None
+            if not args.all:
+                peer = args.peer
+                peers = engine.get_peers()
+                if peer is None and len(peers) == 1:
+                    peer = peers[0]
+                elif peer is None and peers:
+                    raise SyncError(f"Several known peers, pick one with --peer: {', '.join(peers)}")
+            count = engine.export_changes(args.path, peer)
+            print(f"Wrote {count} changes from replica {engine.get_replica_id()} to {args.path}")
+        elif args.command == "import":
+            sender, applied = engine.import_changes(args.path)
+            print(f"Applied {applied} changes from replica {sender}")
+        elif args.command == "sync":
+            if not os.path.exists(args.other):
+                raise SyncError(f"No database at {args.other}")
+            applied_here, applied_there = engine.sync_with(SyncEngine(PlantDatabase(args.other)))
+            print(f"Applied {applied_here} changes to {args.db} and {applied_there} to {args.other}")
+        elif args.command == "clone":
+            if os.path.exists(args.target):
+                raise SyncError(f"{args.target} already exists")
+            clone = engine.clone_replica(args.target)
+            print(f"Created replica {clone.get_replica_id()} at {args.target}")
+    except SyncError as e:
+        print(f"Sync failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+import os
+import tempfile
+import unittest
+
+from database import PlantDatabase
+
+
+class QueryPlantsTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.db = PlantDatabase(os.path.join(self.temp_dir.name, "plants.db"))
+        for name in ["@home", "[bracket", "_under", "Zinnia", "zucchini", "Apple", "apricot", "Basil"]:
+            self.db.add_plant(name, "2024-01-01", "")
+
+    def names(self, prefix):
+        return [plant[1] for plant in self.db.query_plants(sort_by="name", descending=False, name_prefix=prefix)]
+
+    def test_prefix_is_case_insensitive(self):
+        self.assertEqual(self.names("Z"), ["Zinnia", "zucchini"])
+        self.assertEqual(self.names("z"), ["Zinnia", "zucchini"])
+        self.assertEqual(self.names("AP"), ["Apple", "apricot"])
+
+    def test_upper_bound_next_to_capital_letters(self):
+        # '@' + 1 is 'A', which NOCASE would fold to 'a'
+        self.assertEqual(self.names("@"), ["@home"])
+
+
+if __name__ == "__main__":
+    unittest.main()
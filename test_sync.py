@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+
+from archive import JournalArchive
+from database import PlantDatabase
+from sync import SyncEngine
+
+
+class ArchiveSyncTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.first_name = os.path.join(self.temp_dir.name, "first.db")
+        self.second_name = os.path.join(self.temp_dir.name, "second.db")
+
+    def test_archived_entries_are_not_synced_as_deletes(self):
+        first_db = PlantDatabase(self.first_name)
+        plant_id = first_db.add_plant("Fern", "2020-01-01", "Water weekly")
+        first_db.add_journal_entry(plant_id, "2020-03-01", "Repotted")
+
+        first = SyncEngine(first_db)
+        second = first.clone_replica(self.second_name)
+
+        self.assertEqual(JournalArchive(self.first_name).archive_old_entries(), 1)
+        self.assertEqual(first.sync_with(second), (0, 0))
+
+        entries = PlantDatabase(self.second_name).get_journal_entries(plant_id)
+        self.assertEqual([entry[3] for entry in entries], ["Repotted"])
+
+    def test_edits_still_sync_after_archiving(self):
+        first_db = PlantDatabase(self.first_name)
+        plant_id = first_db.add_plant("Fern", "2020-01-01", "Water weekly")
+        first_db.add_journal_entry(plant_id, "2020-03-01", "Repotted")
+
+        first = SyncEngine(first_db)
+        second = first.clone_replica(self.second_name)
+        JournalArchive(self.first_name).archive_old_entries()
+
+        first_db.update_plant(plant_id, "Boston fern", "2020-01-01", "Water weekly")
+        first_db.delete_journal_entry(first_db.add_journal_entry(plant_id, "2025-06-01", "Misted"))
+        self.assertEqual(first.sync_with(second), (0, 2))
+
+        second_db = PlantDatabase(self.second_name)
+        self.assertEqual(second_db.get_plant_by_id(plant_id)[1], "Boston fern")
+        self.assertEqual([entry[3] for entry in second_db.get_journal_entries(plant_id)], ["Repotted"])
+
+    def test_first_export_after_clone_only_carries_new_edits(self):
+        first_db = PlantDatabase(self.first_name)
+        for name in ("Fern", "Basil", "Mint"):
+            first_db.add_plant(name, "2024-01-01", "Water weekly")
+
+        first = SyncEngine(first_db)
+        second = first.clone_replica(self.second_name)
+        PlantDatabase(self.second_name).add_plant("Thyme", "2024-01-01", "Water weekly")
+
+        path = os.path.join(self.temp_dir.name, "changes.json.gz")
+        self.assertEqual(second.export_changes(path, first.get_replica_id()), 1)
+        self.assertEqual(first.import_changes(path), (second.get_replica_id(), 1))
+        self.assertEqual(first.export_changes(path, second.get_replica_id()), 0)
+
+    def test_synced_plant_delete_drops_archived_entries(self):
+        first_db = PlantDatabase(self.first_name)
+        fern = first_db.add_plant("Fern", "2020-01-01", "Water weekly")
+        basil = first_db.add_plant("Basil", "2020-01-01", "Water daily")
+        first_db.add_journal_entry(fern, "2020-03-01", "Repotted")
+        first_db.add_journal_entry(basil, "2020-03-01", "Pinched")
+
+        first = SyncEngine(first_db)
+        second = first.clone_replica(self.second_name)
+        second_archive = JournalArchive(self.second_name)
+        second_archive.archive_old_entries()
+
+        first_db.delete_plant(fern)
+        # The plant and its cascaded journal entry
+        self.assertEqual(first.sync_with(second), (0, 2))
+
+        second_db = PlantDatabase(self.second_name)
+        self.assertFalse(second_archive.has_entries(fern))
+        self.assertEqual(second_db.get_dashboard_stats()["journal_entries"], 1)
+        self.assertEqual(second_db.get_daily_activity("2020-03-01", "2020-03-01"), {"2020-03-01": (0, 1)})
+
+
+if __name__ == "__main__":
+    unittest.main()